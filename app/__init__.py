@@ -1,15 +1,26 @@
 from quart import Quart, session, g
+import aiohttp
+import asyncio
 import asyncpg
 from .config import QuartConfig
+from .db import get_pool, close_pool
+from schema import schema_is_current
 from hypercorn.config import Config
 from .routes import register_routes
 from .middleware import setup_middleware
+from .utils.json_provider import OrjsonProvider
+from .utils.tasks import spawn
+from .utils.email import email_service
+from .utils.pandl_calculator import warm_kernels
 from quart_jwt_extended import JWTManager
 import os
+import socket
 
 
 class App(Quart):
 
+    json_provider_class = OrjsonProvider
+
     def __init__(self, name):
         super().__init__(name)
 
@@ -24,112 +35,49 @@ class App(Quart):
         jwt = JWTManager(self)
 
         self.db_pool = None
+        self.http_session = None
 
 
         @self.before_serving
         async def init_services():
             await self.setup()
-            await self.create_tables()
-
-        async def cleanup():
-            await self.db_pool.close()
-
-    async def create_tables(self):
+            await self.check_schema()
+            email_service.start()
+            # Compile the P&L kernels off the event loop before the first trade
+            await asyncio.to_thread(warm_kernels)
+            # Resolve and connect to the price feeds before the first request.
+            from .routes.trading import warm_price_cache
+            spawn(warm_price_cache())
+
+        @self.after_serving
+        async def shutdown_services():
+            await self.cleanup()
+
+    async def check_schema(self):
+        # Schema changes and seed data are applied by setup_db.py (and the
+        # CONCURRENTLY migrations), never at boot: running DDL here would
+        # lock live tables from every worker at once
         async with self.db_pool.acquire() as conn:
-            # Run database migration to add missing columns
-            await conn.execute('''
-                ALTER TABLE wallet_transactions
-                ADD COLUMN IF NOT EXISTS profit_before DECIMAL(20, 8) DEFAULT 0,
-                ADD COLUMN IF NOT EXISTS profit_after DECIMAL(20, 8) DEFAULT 0
-            ''')
-
-            # Add withdrawal columns
-            await conn.execute('''
-                ALTER TABLE withdrawals
-                ADD COLUMN IF NOT EXISTS network VARCHAR(20),
-                ADD COLUMN IF NOT EXISTS wallet_address VARCHAR(255)
-            ''')
-
-            await conn.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id SERIAL PRIMARY KEY,
-                    email VARCHAR(255) UNIQUE NOT NULL,
-                    password VARCHAR(255) NOT NULL,
-                    role VARCHAR(50) DEFAULT 'user',
-                    is_blocked BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                CREATE TABLE IF NOT EXISTS wallet_transactions (
-                    id SERIAL PRIMARY KEY,
-                    user_id INTEGER REFERENCES users(id),
-                    transaction_type VARCHAR(50) NOT NULL,
-                    amount DECIMAL(20, 8) NOT NULL,
-                    balance_before DECIMAL(20, 8) NOT NULL,
-                    balance_after DECIMAL(20, 8) NOT NULL,
-                    profit_before DECIMAL(20, 8) DEFAULT 0,
-                    profit_after DECIMAL(20, 8) DEFAULT 0,
-                    reference_id VARCHAR(100), -- for trade_id or withdrawal_id
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                CREATE TABLE IF NOT EXISTS trades (
-                    id SERIAL PRIMARY KEY,
-                    user_id INTEGER REFERENCES users(id),
-                    asset VARCHAR(50) NOT NULL,
-                    side VARCHAR(10) NOT NULL,
-                    size DECIMAL(20, 8) NOT NULL,
-                    price DECIMAL(20, 8) NOT NULL,
-                    total DECIMAL(20, 8) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                CREATE TABLE IF NOT EXISTS withdrawals (
-                    id SERIAL PRIMARY KEY,
-                    user_id INTEGER REFERENCES users(id),
-                    amount DECIMAL(20, 8) NOT NULL,
-                    status VARCHAR(50) DEFAULT 'pending',
-                    requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                CREATE TABLE IF NOT EXISTS strategies (
-                    id SERIAL PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL,
-                    description TEXT,
-                    category VARCHAR(50) NOT NULL, -- 'crypto' or 'quant'
-                    risk_level VARCHAR(20) NOT NULL, -- 'low', 'medium', 'high'
-                    expected_roi DECIMAL(5, 2) NOT NULL, -- Daily ROI percentage
-                    min_investment DECIMAL(20, 8) NOT NULL,
-                    max_investment DECIMAL(20, 8),
-                    is_active BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-
-                CREATE TABLE IF NOT EXISTS strategy_subscriptions (
-                    id SERIAL PRIMARY KEY,
-                    user_id INTEGER REFERENCES users(id),
-                    strategy_id INTEGER REFERENCES strategies(id),
-                    invested_amount DECIMAL(20, 8) NOT NULL,
-                    is_active BOOLEAN DEFAULT TRUE,
-                    subscribed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    unsubscribed_at TIMESTAMP,
-                    UNIQUE(user_id, strategy_id)
-                );
-            ''')
+            if not await schema_is_current(conn):
+                self.logger.warning("Database schema is not up to date with supabase_schema.sql; run python setup_db.py")
 
     async def cleanup(self):
-        await self.db_pool.close()
+        await email_service.flush()
+        await email_service.close()
+        if self.http_session is not None:
+            await self.http_session.close()
+        await close_pool()
 
     async def setup(self):
-        self.db_pool = await asyncpg.create_pool(
-            QuartConfig().DATABASE_URL,
-            min_size=1,
-            max_size=5,  # Supabase has connection limits, keep this low
-            max_queries=50000,
-            max_inactive_connection_lifetime=300.0,
-            command_timeout=60,
-            ssl='require'  # Force SSL for Supabase
+        self.db_pool = await get_pool()
+        # One keep-alive session for all upstream HTTP calls; hostnames are
+        # resolved once an hour instead of on every price refresh.
+        self.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                ttl_dns_cache=3600,
+                use_dns_cache=True,
+                family=socket.AF_INET,
+            )
         )
         setup_middleware(self)
         register_routes(self)
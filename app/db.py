@@ -0,0 +1,37 @@
+import asyncio
+
+import asyncpg
+
+from .config import QuartConfig
+
+# One asyncpg pool per process, created on first use and closed on shutdown.
+# setup_db.py opens its own one-connection pool instead.
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_pool():
+    """Return the process-wide pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(
+                    QuartConfig().DATABASE_URL,
+                    min_size=1,
+                    max_size=5,  # Supabase has connection limits, keep this low
+                    max_queries=50000,
+                    max_inactive_connection_lifetime=300.0,
+                    command_timeout=60,
+                    ssl='require'  # Force SSL for Supabase
+                )
+    return _pool
+
+
+async def close_pool():
+    """Close the process-wide pool; the next get_pool() opens a fresh one."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
@@ -91,11 +91,11 @@ async def approve_withdrawal(withdrawal_id):
             user = await conn.fetchrow('SELECT email FROM users WHERE id = $1', withdrawal['user_id'])
             user_email = user['email'] if user else None
 
-            # Send approval email (don't await to avoid blocking)
-            import asyncio
-            asyncio.create_task(email_service.send_withdrawal_approved_email(user_email, float(withdrawal['amount']), withdrawal_id))
+        # Send approval email once the approval has committed (delivered in
+        # the background)
+        await email_service.send_withdrawal_approved_email(user_email, float(withdrawal['amount']), withdrawal_id)
 
-            return jsonify({'message': 'Withdrawal approved successfully'}), 200
+        return jsonify({'message': 'Withdrawal approved successfully'}), 200
 
 @admin_bp.route('/admin/withdrawals/<int:withdrawal_id>/reject', methods=['POST'])
 async def reject_withdrawal(withdrawal_id):
@@ -120,12 +120,11 @@ async def reject_withdrawal(withdrawal_id):
             user = await conn.fetchrow('SELECT email FROM users WHERE id = $1', withdrawal['user_id'])
             user_email = user['email'] if user else None
 
-            import asyncio
-            asyncio.create_task(email_service.send_withdrawal_rejected_email(
-                user_email, float(withdrawal['amount']), withdrawal_id, reason
-            ))
+        await email_service.send_withdrawal_rejected_email(
+            user_email, float(withdrawal['amount']), withdrawal_id, reason
+        )
 
-            return jsonify({'message': 'Withdrawal rejected'}), 200
+        return jsonify({'message': 'Withdrawal rejected'}), 200
 
 @admin_bp.route('/admin/users/<int:user_id>/balance', methods=['POST'])
 async def update_user_balance(user_id):
@@ -169,22 +168,23 @@ async def update_user_balance(user_id):
                     VALUES ($1, $2, $3, $4, $5, $6, $7)
                 ''', user_id, transaction_type, abs(adjustment), current_balance, new_balance, current_profit, current_profit)
 
-                # A positive adjustment is a deposit/credit to the customer —
-                # send a deposit confirmation (fire-and-forget, never blocks).
                 if adjustment > 0:
-                    import asyncio
                     user_row = await conn.fetchrow('SELECT email FROM users WHERE id = $1', user_id)
                     user_email = user_row['email'] if user_row else None
-                    asyncio.create_task(email_service.send_deposit_confirmation_email(
-                        user_email, float(adjustment), float(new_balance)
-                    ))
 
-            return jsonify({
-                'message': 'User balance updated successfully',
-                'previous_balance': current_balance,
-                'new_balance': new_balance,
-                'adjustment': adjustment
-            }), 200
+        # A positive adjustment is a deposit/credit to the customer — send a
+        # deposit confirmation once it has committed (fire-and-forget).
+        if adjustment > 0:
+            await email_service.send_deposit_confirmation_email(
+                user_email, float(adjustment), float(new_balance)
+            )
+
+        return jsonify({
+            'message': 'User balance updated successfully',
+            'previous_balance': current_balance,
+            'new_balance': new_balance,
+            'adjustment': adjustment
+        }), 200
 
 @admin_bp.route('/admin/users/<int:user_id>/balance-info', methods=['GET'])
 async def get_user_balance(user_id):
@@ -2,7 +2,7 @@ from quart import Blueprint, request, jsonify, current_app, g
 from ..middleware import jwt_required_custom, admin_required
 from ..utils.email import email_service
 from ..utils.pandl_calculator import economic_calculator, TradeMetrics, MarketRegime
-import random
+import numpy as np
 
 strategy_bp = Blueprint('strategy', __name__)
 
@@ -82,6 +82,18 @@ DEFAULT_STRATEGIES = [
     }
 ]
 
+# Synthetic market regimes: 10% bear (0.7x), 15% volatile (1.3x), 35% bull
+# (1.1x), otherwise neutral
+_REGIME_THRESHOLDS = np.array([0.1, 0.25, 0.6])
+_REGIME_FACTORS = np.array([0.7, 1.3, 1.1, 1.0])
+_rng = np.random.default_rng()
+
+def synthetic_daily_returns(daily_roi_rate: float, days: int) -> np.ndarray:
+    """Daily returns around daily_roi_rate with volatility and regime effects"""
+    volatility_factor = 0.8 + _rng.random(days) * 0.4  # 0.8 to 1.2
+    regime_factor = _REGIME_FACTORS[np.searchsorted(_REGIME_THRESHOLDS, _rng.random(days), side='right')]
+    return daily_roi_rate * volatility_factor * regime_factor
+
 @strategy_bp.route('', methods=['GET'])
 async def get_strategies():
     """Get all available strategies"""
@@ -172,27 +184,9 @@ async def get_my_strategies():
                 if days_active == 0:
                     days_active = 1
 
-                # Create synthetic daily returns based on strategy performance
-                daily_returns = []
-                base_daily_return = daily_roi_rate
-
-                # Add volatility and market regime effects
-                for day in range(days_active):
-                    # Simulate market volatility
-                    volatility_factor = 0.8 + (random.random() * 0.4)  # 0.8 to 1.2
-                    regime_factor = 1.0
-
-                    # Simulate different market regimes
-                    regime_roll = random.random()
-                    if regime_roll < 0.1:  # 10% chance of bear market
-                        regime_factor = 0.7
-                    elif regime_roll < 0.25:  # 15% chance of volatile market
-                        regime_factor = 1.3
-                    elif regime_roll < 0.6:  # 35% chance of bull market
-                        regime_factor = 1.1
-
-                    daily_return = base_daily_return * volatility_factor * regime_factor
-                    daily_returns.append(daily_return)
+                # Create synthetic daily returns based on strategy performance,
+                # with volatility and market regime effects
+                daily_returns = synthetic_daily_returns(daily_roi_rate, days_active)
 
                 # Use advanced calculator for strategy performance
                 performance = economic_calculator.calculate_strategy_performance_economics(
@@ -334,16 +328,17 @@ async def subscribe_to_strategy(strategy_id):
             # Get user email for notification
             user_email_row = await conn.fetchrow('SELECT email FROM users WHERE id = $1', user_id)
             user_email = user_email_row['email'] if user_email_row else None
-            import asyncio
-            asyncio.create_task(email_service.send_strategy_subscription_email(
-                user_email, strategy['name'], float(invested_amount), 
-                float(strategy['expected_roi']), strategy['risk_level']
-            ))
 
-            return jsonify({
-                'message': f'Successfully subscribed to {strategy["name"]}',
-                'subscription_id': subscription_id
-            }), 201
+        # Notify after the connection is back in the pool
+        await email_service.send_strategy_subscription_email(
+            user_email, strategy['name'], float(invested_amount), 
+            float(strategy['expected_roi']), strategy['risk_level']
+        )
+
+        return jsonify({
+            'message': f'Successfully subscribed to {strategy["name"]}',
+            'subscription_id': subscription_id
+        }), 201
 
     except Exception as e:
         current_app.logger.error(f"Error subscribing to strategy: {e}")
@@ -382,24 +377,8 @@ async def unsubscribe_from_strategy(strategy_id):
 
             # Generate synthetic returns for advanced calculation
             days_active = max(1, int(days_elapsed))
-            daily_returns = []
             daily_roi_rate = float(subscription['expected_roi']) / 100
-
-            import random
-            for day in range(days_active):
-                volatility_factor = 0.8 + (random.random() * 0.4)
-                regime_factor = 1.0
-
-                regime_roll = random.random()
-                if regime_roll < 0.1:
-                    regime_factor = 0.7
-                elif regime_roll < 0.25:
-                    regime_factor = 1.3
-                elif regime_roll < 0.6:
-                    regime_factor = 1.1
-
-                daily_return = daily_roi_rate * volatility_factor * regime_factor
-                daily_returns.append(daily_return)
+            daily_returns = synthetic_daily_returns(daily_roi_rate, days_active)
 
             # Use advanced calculator
             performance = economic_calculator.calculate_strategy_performance_economics(
@@ -446,20 +425,20 @@ async def unsubscribe_from_strategy(strategy_id):
                 VALUES ($1, 'strategy_unsubscription', $2, $3, $4, $5, $6)
             ''', user_id, return_amount, current_balance, current_balance + return_amount, current_profit, current_profit)
 
-            # Confirmation email — allocation released (fire-and-forget)
-            import asyncio
             user_row = await conn.fetchrow('SELECT email FROM users WHERE id = $1', user_id)
             user_email = user_row['email'] if user_row else None
-            asyncio.create_task(email_service.send_strategy_unsubscribe_email(
-                user_email, subscription['name'], invested_amount, total_earnings, return_amount
-            ))
-
-            return jsonify({
-                'message': f'Successfully unsubscribed from {subscription["name"]}',
-                'returned_amount': return_amount,
-                'invested_amount': invested_amount,
-                'earnings': total_earnings
-            }), 200
+
+        # Confirmation email — allocation released (fire-and-forget)
+        await email_service.send_strategy_unsubscribe_email(
+            user_email, subscription['name'], invested_amount, total_earnings, return_amount
+        )
+
+        return jsonify({
+            'message': f'Successfully unsubscribed from {subscription["name"]}',
+            'returned_amount': return_amount,
+            'invested_amount': invested_amount,
+            'earnings': total_earnings
+        }), 200
 
     except Exception as e:
         current_app.logger.error(f"Error unsubscribing from strategy: {e}")
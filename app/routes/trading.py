@@ -1,18 +1,21 @@
 from quart import Blueprint, request, jsonify, current_app, g
 from ..middleware import jwt_required_custom
 from ..utils.email import email_service
-from ..utils.pandl_calculator import economic_calculator, TradeMetrics, MarketRegime
+from ..utils.tasks import spawn
+from ..utils.pandl_calculator import economic_calculator, chinese_market_regime, TradeMetrics, MarketRegime
+import aiohttp
 import asyncio
 import os
 import time
 import numpy as np
-from typing import Dict, Optional, List, Tuple, Callable
-import json
-import urllib.request
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Awaitable, Dict, Optional, List, Tuple
 
 trading_bp = Blueprint('trading', __name__)
 
+# Shared generator for the synthetic market data used by the P&L engine.
+_RNG = np.random.default_rng()
+
 # Human-readable lead-trader display names (the names live only on the frontend).
 COPY_TRADER_NAMES = {'trader1': 'Alex Chen', 'trader2': 'Sarah Williams', 'trader3': 'Mike Johnson'}
 
@@ -25,15 +28,16 @@ COPY_TRADER_NAMES = {'trader1': 'Alex Chen', 'trader2': 'Sarah Williams', 'trade
 # Caching: one warm in-memory cache served with stale-while-revalidate +
 # single-flight refresh. User requests are answered instantly from cache and
 # never block on upstream; the cache is refreshed at most once per TTL no
-# matter how much traffic arrives. All symbols are fetched concurrently, and a
-# failed fetch keeps the last good value instead of dropping the symbol.
+# matter how much traffic arrives. All symbols are fetched concurrently over one
+# shared keep-alive session (DNS cached on the connector), and a failed fetch
+# keeps the last good value instead of dropping the symbol.
 # Trade fills force a fresh fetch so they never execute on stale data.
 # ---------------------------------------------------------------------------
 
 FINNHUB_API_KEY = os.environ.get('FINNHUB_API_KEY', '')
 FINNHUB_BASE = 'https://finnhub.io/api/v1'
 COINBASE_BASE = 'https://api.exchange.coinbase.com'
-_HTTP_TIMEOUT = 6  # seconds
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=6)
 
 # Unified price cache: { platform_symbol: {price, change, ..., timestamp} }
 _price_cache: Dict[str, Dict] = {}
@@ -73,14 +77,14 @@ ASSET_META = [
 ]
 
 
-def _http_get_json(url: str) -> dict:
-    req = urllib.request.Request(url, headers={'User-Agent': 'astrid-trading/1.0'})
-    with urllib.request.urlopen(req, timeout=_HTTP_TIMEOUT) as resp:
-        return json.loads(resp.read().decode('utf-8'))
+async def _http_get_json(session: aiohttp.ClientSession, url: str) -> dict:
+    async with session.get(url, timeout=_HTTP_TIMEOUT) as resp:
+        resp.raise_for_status()
+        return await resp.json(content_type=None)
 
 
-def _fetch_coinbase(product: str) -> Optional[Dict]:
-    stats = _http_get_json(f'{COINBASE_BASE}/products/{product}/stats')
+async def _fetch_coinbase(session: aiohttp.ClientSession, product: str) -> Optional[Dict]:
+    stats = await _http_get_json(session, f'{COINBASE_BASE}/products/{product}/stats')
     last = float(stats.get('last') or 0)
     if last == 0:
         return None
@@ -97,10 +101,10 @@ def _fetch_coinbase(product: str) -> Optional[Dict]:
     }
 
 
-def _fetch_finnhub(symbol: str) -> Optional[Dict]:
+async def _fetch_finnhub(session: aiohttp.ClientSession, symbol: str) -> Optional[Dict]:
     if not FINNHUB_API_KEY:
         return None
-    data = _http_get_json(f'{FINNHUB_BASE}/quote?symbol={symbol}&token={FINNHUB_API_KEY}')
+    data = await _http_get_json(session, f'{FINNHUB_BASE}/quote?symbol={symbol}&token={FINNHUB_API_KEY}')
     price = float(data.get('c') or 0)
     if price == 0:
         return None
@@ -114,30 +118,30 @@ def _fetch_finnhub(symbol: str) -> Optional[Dict]:
     }
 
 
-def _fetch_all_prices_sync() -> Dict[str, Optional[Dict]]:
-    """Fetch every symbol concurrently (crypto: Coinbase, stocks: Finnhub)."""
-    jobs: List[Tuple[str, Callable[[], Optional[Dict]]]] = []
+async def _fetch_all_prices() -> Dict[str, Optional[Dict]]:
+    """Fetch every symbol concurrently (crypto: Coinbase, stocks: Finnhub) over
+    the app's shared keep-alive HTTP session."""
+    session = current_app.http_session
+    jobs: List[Tuple[str, Awaitable[Optional[Dict]]]] = []
     for platform_sym, product in CRYPTO_COINBASE.items():
-        jobs.append((platform_sym, lambda p=product: _fetch_coinbase(p)))
+        jobs.append((platform_sym, _fetch_coinbase(session, product)))
     for platform_sym, fh_sym in STOCK_FINNHUB.items():
-        jobs.append((platform_sym, lambda s=fh_sym: _fetch_finnhub(s)))
+        jobs.append((platform_sym, _fetch_finnhub(session, fh_sym)))
 
+    outcomes = await asyncio.gather(*(job for _, job in jobs), return_exceptions=True)
     results: Dict[str, Optional[Dict]] = {}
-    with ThreadPoolExecutor(max_workers=min(10, len(jobs))) as pool:
-        future_map = {pool.submit(fn): sym for sym, fn in jobs}
-        for fut in as_completed(future_map):
-            sym = future_map[fut]
-            try:
-                results[sym] = fut.result()
-            except Exception as e:
-                print(f"price fetch error for {sym}: {e}")
-                results[sym] = None
+    for (sym, _), outcome in zip(jobs, outcomes):
+        if isinstance(outcome, Exception):
+            current_app.logger.warning("price fetch error for %s: %s", sym, outcome)
+            results[sym] = None
+        else:
+            results[sym] = outcome
     return results
 
 
 async def _refresh_cache():
     """Refresh from upstream. Keeps last-good values for any failed symbol."""
-    raw = await asyncio.to_thread(_fetch_all_prices_sync)
+    raw = await _fetch_all_prices()
     now = time.time()
     for platform_sym, data in raw.items():
         if data:
@@ -166,7 +170,13 @@ async def _ensure_prices():
             async with _refresh_lock:
                 if not _cache_valid():
                     await _refresh_cache()
-        asyncio.create_task(_bg())
+        spawn(_bg())
+
+
+async def warm_price_cache():
+    """Prime the cache at startup so the first /prices and /trade calls don't
+    pay for DNS, TCP and TLS setup to the upstream feeds."""
+    await _ensure_prices()
 
 
 async def get_current_price(asset: str) -> Optional[float]:
@@ -199,6 +209,51 @@ async def place_trade():
 
     user_id = g.user_id
     total = size * price
+
+    # Calculate advanced P&L metrics using Newton/Chinese Quant methods.
+    # Nothing here reads the database, so it runs before the transaction
+    # opens and never holds the asset_buy_totals row lock.
+    # Generate synthetic market data for P&L calculation
+    timestamps = [datetime.now() - timedelta(hours=i) for i in range(24, 0, -1)]  # 24 hours of data
+
+    # Random walk: each hourly step is N(0, 2% of the previous price)
+    synthetic_prices = price * np.cumprod(1 + _RNG.standard_normal(24) * 0.02)
+    synthetic_volumes = _RNG.uniform(1000, 10000, 24)  # Random volume
+    recent_prices = synthetic_prices[-10:]
+
+    # Calculate trade metrics
+    trade_metrics = TradeMetrics(
+        entry_price=price,
+        exit_price=price,  # For now, assume no exit (unrealized P&L)
+        position_size=float(size),
+        holding_period=1,  # Start with 1 hour
+        volatility_at_entry=float(recent_prices.std() / recent_prices.mean()),
+        market_regime=chinese_market_regime(synthetic_prices, synthetic_volumes),
+        momentum_score=float(synthetic_prices[-1] / synthetic_prices[0] - 1),
+        technical_score=float(_RNG.uniform(0.3, 0.8)),  # Simplified technical score
+        fundamental_score=float(_RNG.uniform(0.4, 0.9)),  # Simplified fundamental score
+        behavioral_bias=0.0,
+        transaction_costs=0.0
+    )
+
+    # Calculate advanced P&L
+    pnl_result = economic_calculator.calculate_comprehensive_pnl(
+        trade_metrics, {
+            'price_changes': synthetic_prices[1:] - synthetic_prices[0],
+            'volume_changes': synthetic_volumes[1:],
+            'historical_returns': np.diff(synthetic_prices) / synthetic_prices[:-1]
+        }, {
+            'economic_cycle_position': 0.6,  # Assume expansion phase
+            'money_supply_growth': 0.02,
+            'inflation_expectations': 0.02,
+            'debt_to_equity': 1.5,
+            'interest_coverage': 3.0,
+            'cash_flow_volatility': 0.15,
+            'education_years': 16,
+            'experience_years': 5
+        }
+    )
+
     async with current_app.db_pool.acquire() as conn:
         async with conn.transaction():
             # Check balance for buy orders
@@ -224,36 +279,30 @@ async def place_trade():
             else:
                 # For sell orders, check if there are matching buy orders first
                 # Check if total sell quantity exceeds existing buy orders for this asset
+                # (running total kept in asset_buy_totals; row lock serializes concurrent sells)
                 buy_orders_total = await conn.fetchrow('''
-                    SELECT COALESCE(SUM(size), 0) as total_buy_size
-                    FROM trades
-                    WHERE asset = $1 AND side = 'buy'
+                    SELECT total_size
+                    FROM asset_buy_totals
+                    WHERE asset = $1
+                    FOR UPDATE
                 ''', asset)
 
-                total_buy_quantity = float(buy_orders_total['total_buy_size']) if buy_orders_total else 0.0
+                total_buy_quantity = float(buy_orders_total['total_size']) if buy_orders_total else 0.0
 
                 if total_buy_quantity < size:
                     return jsonify({'message': f'Insufficient buy orders for {asset}. Available: {total_buy_quantity}, Requested: {size}'}), 400
 
                 # Get current balance and profit for sell transaction
-                balance_result = await conn.fetchrow('''
-                    SELECT balance_after
+                wallet_row = await conn.fetchrow('''
+                    SELECT balance_after, profit_after
                     FROM wallet_transactions
                     WHERE user_id = $1
                     ORDER BY created_at DESC
                     LIMIT 1
                 ''', user_id)
 
-                profit_result = await conn.fetchrow('''
-                    SELECT profit_after
-                    FROM wallet_transactions
-                    WHERE user_id = $1
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                ''', user_id)
-
-                current_balance = float(balance_result['balance_after']) if balance_result else 0.0
-                current_profit = float(profit_result['profit_after']) if profit_result else 0.0
+                current_balance = float(wallet_row['balance_after']) if wallet_row else 0.0
+                current_profit = float(wallet_row['profit_after']) if wallet_row else 0.0
 
                 # Record sell transaction
                 await conn.execute('''
@@ -268,55 +317,13 @@ async def place_trade():
                 RETURNING id, asset, side, size, price, total, created_at
             ''', user_id, asset, side, size, price, total)
 
-            # Calculate advanced P&L metrics using Newton/Chinese Quant methods
-            import random
-            from datetime import datetime, timedelta
-
-            # Generate synthetic market data for P&L calculation
-            timestamps = [datetime.now() - timedelta(hours=i) for i in range(24, 0, -1)]  # 24 hours of data
-            synthetic_prices = []
-            synthetic_volumes = []
-
-            # Generate realistic price movements
-            current_price = price
-            for i in range(24):
-                # Add random walk with mean reversion
-                change = random.gauss(0, current_price * 0.02)  # 2% volatility
-                current_price += change
-                current_price = max(current_price * 0.95, min(current_price * 1.05, current_price))  # Bound price movements
-                synthetic_prices.append(current_price)
-                synthetic_volumes.append(random.uniform(1000, 10000))  # Random volume
-
-            # Calculate trade metrics
-            trade_metrics = TradeMetrics(
-                entry_price=price,
-                exit_price=price,  # For now, assume no exit (unrealized P&L)
-                position_size=float(size),
-                holding_period=1,  # Start with 1 hour
-                volatility_at_entry=np.std(synthetic_prices[-10:]) / np.mean(synthetic_prices[-10:]) if len(synthetic_prices) >= 10 else 0.02,
-                market_regime=economic_calculator.chinese_calc.calculate_market_regime(synthetic_prices, synthetic_volumes),
-                momentum_score=(synthetic_prices[-1] - synthetic_prices[0]) / synthetic_prices[0] if synthetic_prices else 0,
-                technical_score=random.uniform(0.3, 0.8),  # Simplified technical score
-                fundamental_score=random.uniform(0.4, 0.9)   # Simplified fundamental score
-            )
-
-            # Calculate advanced P&L
-            pnl_result = economic_calculator.calculate_comprehensive_pnl(
-                trade_metrics, {
-                    'price_changes': [p - synthetic_prices[0] for p in synthetic_prices[1:]],
-                    'volume_changes': synthetic_volumes[1:],
-                    'historical_returns': [(synthetic_prices[i] - synthetic_prices[i-1]) / synthetic_prices[i-1] for i in range(1, len(synthetic_prices))]
-                }, {
-                    'economic_cycle_position': 0.6,  # Assume expansion phase
-                    'money_supply_growth': 0.02,
-                    'inflation_expectations': 0.02,
-                    'debt_to_equity': 1.5,
-                    'interest_coverage': 3.0,
-                    'cash_flow_volatility': 0.15,
-                    'education_years': 16,
-                    'experience_years': 5
-                }
-            )
+            # Keep the running buy total net of this fill (buys add, sells subtract)
+            await conn.execute('''
+                INSERT INTO asset_buy_totals (asset, total_size)
+                VALUES ($1, $2)
+                ON CONFLICT (asset) DO UPDATE
+                SET total_size = asset_buy_totals.total_size + EXCLUDED.total_size
+            ''', asset, size if side == 'buy' else -size)
 
             # Store advanced trade profit metrics
             await conn.execute('''
@@ -331,7 +338,7 @@ async def place_trade():
                  pnl_result['final_pnl'] if side == 'buy' else 0,   # Unrealized P&L for buys
                  1, trade_metrics.volatility_at_entry, trade_metrics.market_regime.value,
                  pnl_result['final_pnl'] / (price * float(size)) if price * float(size) != 0 else 0,  # Risk-adjusted return
-                 pnl_result['quantum_score'], 1.0,  # Beta exposure
+                 0.0, 1.0,  # Alpha contribution (not modelled), beta exposure
                  trade_metrics.momentum_score, trade_metrics.technical_score, trade_metrics.fundamental_score)
 
             # Update profit snapshots
@@ -358,22 +365,22 @@ async def place_trade():
             user_email_row = await conn.fetchrow('SELECT email FROM users WHERE id = $1', user_id)
             user_email = user_email_row['email'] if user_email_row else None
             
-            # Send trade execution email (don't await to avoid blocking)
-            import asyncio
-            asyncio.create_task(email_service.send_trade_executed_email(user_email, asset, side, float(size), float(price), total))
-
-            return jsonify({
-                'message': f'{side.capitalize()} order placed successfully',
-                'trade': {
-                    'id': trade['id'],
-                    'asset': trade['asset'],
-                    'side': trade['side'],
-                    'size': float(trade['size']),
-                    'price': float(trade['price']),
-                    'total': float(trade['total']),
-                    'created_at': trade['created_at'].isoformat()
-                }
-            }), 200
+        # Send trade execution email once the trade has committed
+        # (delivered in the background)
+        await email_service.send_trade_executed_email(user_email, asset, side, float(size), float(price), total)
+
+        return jsonify({
+            'message': f'{side.capitalize()} order placed successfully',
+            'trade': {
+                'id': trade['id'],
+                'asset': trade['asset'],
+                'side': trade['side'],
+                'size': float(trade['size']),
+                'price': float(trade['price']),
+                'total': float(trade['total']),
+                'created_at': trade['created_at'].isoformat()
+            }
+        }), 200
 
 @trading_bp.route('/trades', methods=['GET'])
 @jwt_required_custom
@@ -381,23 +388,21 @@ async def get_trades():
     user_id = g.user_id
 
     async with current_app.db_pool.acquire() as conn:
-        trades = await conn.fetch('''
-            SELECT id, asset, side, size, price, total, created_at
+        # Postgres renders the whole JSON document; no per-row Python work.
+        body = await conn.fetchval('''
+            SELECT jsonb_build_object('trades', COALESCE(jsonb_agg(jsonb_build_object(
+                'id', id,
+                'asset', asset,
+                'side', side,
+                'size', size::float8,
+                'price', price::float8,
+                'created_at', created_at
+            ) ORDER BY created_at DESC), '[]'::jsonb))
             FROM trades
             WHERE user_id = $1
-            ORDER BY created_at DESC
         ''', user_id)
 
-        trade_list = [{
-            'id': t['id'],
-            'asset': t['asset'],
-            'side': t['side'],
-            'size': float(t['size']),
-            'price': float(t['price']),
-            'created_at': t['created_at'].isoformat()
-        } for t in trades]
-
-        return jsonify({'trades': trade_list}), 200
+        return current_app.response_class(body, mimetype='application/json'), 200
 
 @trading_bp.route('/copy/subscribe', methods=['POST'])
 @jwt_required_custom
@@ -436,10 +441,9 @@ async def subscribe_to_trader():
         row = await conn.fetchrow('SELECT email FROM users WHERE id = $1', user_id)
         user_email = row['email'] if row else None
 
-        # Send copy-trading confirmation email (don't await to avoid blocking)
-        import asyncio
+        # Send copy-trading confirmation email (delivered in the background)
         trader_name = COPY_TRADER_NAMES.get(trader_id, 'your selected lead trader')
-        asyncio.create_task(email_service.send_copy_trading_email(user_email, trader_name, float(allocation)))
+        await email_service.send_copy_trading_email(user_email, trader_name, float(allocation))
 
         return jsonify({'message': 'Successfully subscribed to trader'}), 200
 
@@ -449,22 +453,19 @@ async def get_subscriptions():
     user_id = g.user_id
 
     async with current_app.db_pool.acquire() as conn:
-        subscriptions = await conn.fetch('''
-            SELECT id, trader_id, allocation, is_active, created_at
+        body = await conn.fetchval('''
+            SELECT jsonb_build_object('subscriptions', COALESCE(jsonb_agg(jsonb_build_object(
+                'id', id,
+                'trader_id', trader_id,
+                'allocation', allocation::float8,
+                'is_active', is_active,
+                'created_at', created_at
+            ) ORDER BY created_at DESC), '[]'::jsonb))
             FROM copy_trading_subscriptions
             WHERE follower_id = $1 AND is_active = true
-            ORDER BY created_at DESC
         ''', user_id)
 
-        subscription_list = [{
-            'id': s['id'],
-            'trader_id': s['trader_id'],
-            'allocation': float(s['allocation']),
-            'is_active': s['is_active'],
-            'created_at': s['created_at'].isoformat()
-        } for s in subscriptions]
-
-        return jsonify({'subscriptions': subscription_list}), 200
+        return current_app.response_class(body, mimetype='application/json'), 200
 
 @trading_bp.route('/prices', methods=['GET'])
 async def get_prices():
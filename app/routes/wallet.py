@@ -75,29 +75,30 @@ async def withdraw():
                 RETURNING id, amount, status, requested_at, network, wallet_address
             ''', user_id, amount, network, wallet_address)
 
-            # Send withdrawal request email (don't await to avoid blocking)
-            import asyncio
             user_email_row = await conn.fetchrow('SELECT email FROM users WHERE id = $1', user_id)
             user_email = user_email_row['email'] if user_email_row else None
-            asyncio.create_task(email_service.send_withdrawal_request_email(
-                user_email, 
-                float(amount), 
-                withdrawal['id'],
-                network,
-                wallet_address
-            ))
-
-            return jsonify({
-                'message': 'Withdrawal request submitted',
-                'withdrawal': {
-                    'id': withdrawal['id'],
-                    'amount': float(withdrawal['amount']),
-                    'status': withdrawal['status'],
-                    'network': withdrawal['network'],
-                    'wallet_address': withdrawal['wallet_address'],
-                    'requested_at': withdrawal['requested_at'].isoformat()
-                }
-            }), 200
+
+        # Send withdrawal request email once the request has committed
+        # (delivered in the background)
+        await email_service.send_withdrawal_request_email(
+            user_email, 
+            float(amount), 
+            withdrawal['id'],
+            network,
+            wallet_address
+        )
+
+        return jsonify({
+            'message': 'Withdrawal request submitted',
+            'withdrawal': {
+                'id': withdrawal['id'],
+                'amount': float(withdrawal['amount']),
+                'status': withdrawal['status'],
+                'network': withdrawal['network'],
+                'wallet_address': withdrawal['wallet_address'],
+                'requested_at': withdrawal['requested_at'].isoformat()
+            }
+        }), 200
 
 @wallet_bp.route('/transfer', methods=['POST'])
 @jwt_required_custom
@@ -158,14 +159,15 @@ async def transfer():
                 VALUES ($1, 'transfer_in', $2, $3, $4)
             ''', recipient['id'], amount, recipient_balance_before, recipient_balance_after)
 
-            # Send transfer emails (don't await to avoid blocking)
-            import asyncio
             sender_row = await conn.fetchrow('SELECT email FROM users WHERE id = $1', user_id)
             sender_email = sender_row['email'] if sender_row else None
-            asyncio.create_task(email_service.send_transfer_sent_email(sender_email, float(amount), recipient_email, float(sender_balance - amount)))
-            asyncio.create_task(email_service.send_transfer_received_email(recipient_email, float(amount), sender_email, float(recipient_balance_after)))
 
-            return jsonify({'message': 'Transfer successful'}), 200
+        # Send transfer emails once the transfer has committed (delivered in
+        # the background)
+        await email_service.send_transfer_sent_email(sender_email, float(amount), recipient_email, float(sender_balance - amount))
+        await email_service.send_transfer_received_email(recipient_email, float(amount), sender_email, float(recipient_balance_after))
+
+        return jsonify({'message': 'Transfer successful'}), 200
 
 @wallet_bp.route('/withdrawals', methods=['GET'])
 @jwt_required_custom
@@ -173,23 +175,21 @@ async def get_withdrawals():
     user_id = g.user_id
 
     async with current_app.db_pool.acquire() as conn:
-        withdrawals = await conn.fetch('''
-            SELECT id, amount, status, requested_at, network, wallet_address
+        # Postgres renders the whole JSON document; no per-row Python work.
+        body = await conn.fetchval('''
+            SELECT jsonb_build_object('withdrawals', COALESCE(jsonb_agg(jsonb_build_object(
+                'id', id,
+                'amount', amount::float8,
+                'status', status,
+                'network', network,
+                'wallet_address', wallet_address,
+                'created_at', requested_at
+            ) ORDER BY requested_at DESC), '[]'::jsonb))
             FROM withdrawals
             WHERE user_id = $1
-            ORDER BY requested_at DESC
         ''', user_id)
 
-        withdrawal_list = [{
-            'id': w['id'],
-            'amount': float(w['amount']),
-            'status': w['status'],
-            'network': w['network'],
-            'wallet_address': w['wallet_address'],
-            'created_at': w['requested_at'].isoformat()
-        } for w in withdrawals]
-
-        return jsonify({'withdrawals': withdrawal_list}), 200
+        return current_app.response_class(body, mimetype='application/json'), 200
 
 @wallet_bp.route('/deposits', methods=['GET'])
 @jwt_required_custom
@@ -197,20 +197,17 @@ async def get_deposits():
     user_id = g.user_id
 
     async with current_app.db_pool.acquire() as conn:
-        deposits = await conn.fetch('''
-            SELECT id, transaction_type, amount, balance_before, balance_after, created_at
+        body = await conn.fetchval('''
+            SELECT jsonb_build_object('deposits', COALESCE(jsonb_agg(jsonb_build_object(
+                'id', id,
+                'amount', amount::float8,
+                'balance_before', balance_before::float8,
+                'balance_after', balance_after::float8,
+                'created_at', created_at,
+                'type', transaction_type
+            ) ORDER BY created_at DESC), '[]'::jsonb))
             FROM wallet_transactions
             WHERE user_id = $1 AND transaction_type = 'deposit'
-            ORDER BY created_at DESC
         ''', user_id)
 
-        deposit_list = [{
-            'id': d['id'],
-            'amount': float(d['amount']),
-            'balance_before': float(d['balance_before']),
-            'balance_after': float(d['balance_after']),
-            'created_at': d['created_at'].isoformat(),
-            'type': d['transaction_type']
-        } for d in deposits]
-
-        return jsonify({'deposits': deposit_list}), 200
+        return current_app.response_class(body, mimetype='application/json'), 200
@@ -1,11 +1,27 @@
-import resend
+import aiohttp
+import asyncio
+import orjson
+import hashlib
+import logging
+import logging.handlers
 import os
+import queue
+import re
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from html import escape
+from string import Template
 from quart import current_app
+from .tasks import spawn
 from pathlib import Path
 from datetime import datetime, timezone
 
 TEMPLATES_DIR = Path(__file__).parent.parent.parent / "emails"
 
+log = logging.getLogger("email_service")
+
 # ---------------------------------------------------------------------------
 # Astrid Global — transactional email system.
 # Visual language: an institutional private-wealth aesthetic (think a
@@ -34,6 +50,18 @@ SERIF = "Georgia, 'Times New Roman', Times, serif"
 SANS = "-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif"
 MONO = "'SF Mono', SFMono-Regular, Menlo, Consolas, 'Liberation Mono', monospace"
 
+RESEND_API_URL = "https://api.resend.com/emails"
+RESEND_BATCH_URL = "https://api.resend.com/emails/batch"
+BATCH_MAX = 100          # Resend's per-request limit for the batch endpoint
+BATCH_DEBOUNCE = 0.05    # seconds to let a burst accumulate before posting
+DEDUP_WINDOW = 60        # seconds an identical message is suppressed for
+DEDUP_MAX = 2048         # recent message hashes remembered
+
+# Cheap shape check so malformed recipients never cost an API round-trip.
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", re.ASCII)
+# Sends per upstream session before it is swapped for a fresh one.
+MAX_SENDS_PER_SESSION = 10000
+
 APP_URL = "https://astridgloballtd.pro"
 SUPPORT_EMAIL = "support@astridgloballtd.pro"
 
@@ -49,6 +77,13 @@ def _now_utc() -> str:
     return datetime.now(timezone.utc).strftime("%d %b %Y, %H:%M UTC")
 
 
+@lru_cache(maxsize=4096)
+def _esc(text: str) -> str:
+    """Escape a user- or client-supplied value for interpolation into HTML.
+    Memoized: asset symbols and strategy names repeat across sends."""
+    return escape(text, quote=False)
+
+
 def _ref(prefix: str, value) -> str:
     return f"{prefix}-{value}"
 
@@ -106,9 +141,16 @@ def _button(label: str, href: str) -> str:
     )
 
 
+# tone -> (rule colour, text colour) for _note
+NOTE_TONES = {
+    "muted": (HAIR, MUTED),
+    "warn": (WARN, WARN),
+    "bad": (BAD, BAD),
+}
+
+
 def _note(html: str, tone: str = "muted") -> str:
-    border = {"muted": HAIR, "warn": WARN, "bad": BAD}.get(tone, HAIR)
-    color = {"muted": MUTED, "warn": WARN, "bad": BAD}.get(tone, MUTED)
+    border, color = NOTE_TONES.get(tone, NOTE_TONES["muted"])
     return (
         f'<div style="border-left:3px solid {border};padding:2px 0 2px 16px;margin:0 0 20px;">'
         f'<p style="color:{color};font-family:{SANS};font-size:13px;line-height:1.6;margin:0;">{html}</p></div>'
@@ -126,11 +168,9 @@ def _heading(text: str) -> str:
     )
 
 
-def _layout(category: str, title: str, content_html: str, recipient: str = None) -> str:
-    recipient_line = (
-        f'This confirmation was sent to {recipient}. ' if recipient else ''
-    )
-    return f"""<!DOCTYPE html>
+# The page shell is rendered once at import with the palette baked in; each
+# send only fills the four per-message slots.
+_LAYOUT = Template(f"""<!DOCTYPE html>
 <html>
 <head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
 <meta name="color-scheme" content="light"></head>
@@ -151,9 +191,9 @@ def _layout(category: str, title: str, content_html: str, recipient: str = None)
 
   <!-- Card -->
   <tr><td style="background-color:{WHITE};border:1px solid {HAIR};border-radius:6px;padding:40px 36px;">
-    <p style="color:{BRONZE};font-family:{SANS};font-size:11px;font-weight:700;letter-spacing:2px;text-transform:uppercase;margin:0 0 10px;">{category}</p>
-    <h1 style="color:{INK};font-family:{SERIF};font-size:26px;font-weight:700;line-height:1.25;margin:0 0 22px;">{title}</h1>
-    {content_html}
+    <p style="color:{BRONZE};font-family:{SANS};font-size:11px;font-weight:700;letter-spacing:2px;text-transform:uppercase;margin:0 0 10px;">$category</p>
+    <h1 style="color:{INK};font-family:{SERIF};font-size:26px;font-weight:700;line-height:1.25;margin:0 0 22px;">$title</h1>
+    $content_html
   </td></tr>
 
   <!-- Footer -->
@@ -164,7 +204,7 @@ def _layout(category: str, title: str, content_html: str, recipient: str = None)
       Questions? Contact <a href="mailto:{SUPPORT_EMAIL}" style="color:{NAVY};text-decoration:none;">{SUPPORT_EMAIL}</a>
     </p>
     <p style="color:{FAINT};font-family:{SANS};font-size:11px;line-height:1.7;margin:0;">
-      {recipient_line}This is an automated message regarding your account; please do not reply.
+      ${{recipient_line}}This is an automated message regarding your account; please do not reply.
       This communication is confidential and intended solely for the named recipient.
       Investing involves risk, including the possible loss of principal; past performance and
       target returns are not guarantees of future results. © 2026 Astrid Global Ltd. All rights reserved.
@@ -175,319 +215,595 @@ def _layout(category: str, title: str, content_html: str, recipient: str = None)
 </td></tr>
 </table>
 </body>
-</html>"""
+</html>""")
+
+
+def _layout(category: str, title: str, content_html: str, recipient: str = None) -> str:
+    recipient_line = (
+        f'This confirmation was sent to {_esc(recipient)}. ' if recipient else ''
+    )
+    return _LAYOUT.substitute(
+        category=category,
+        title=title,
+        content_html=content_html,
+        recipient_line=recipient_line,
+    )
+
+
+@lru_cache(maxsize=256)
+def _welcome_content(display_name: str) -> str:
+    """Welcome body depends only on the display name, and most sign-ups use the default."""
+    return (
+        _para(f"Dear {display_name},")
+        + _para(
+            "Welcome to Astrid Global. Your account has been opened and your portal is "
+            "ready. From a single, secure dashboard you can fund your account, invest across "
+            "digital assets and equities, and follow our managed strategies."
+        )
+        + _heading("Your portal at a glance")
+        + _rows([
+            ("Fund &amp; manage", "Deposit, withdraw and transfer with full transaction records"),
+            ("Markets", "Trade crypto and equities on real-time pricing"),
+            ("Managed strategies", "Allocate to curated, risk-rated strategies"),
+            ("Oversight", "Monitor performance and statements 24/7"),
+        ])
+        + _button("Enter your portal", f"{APP_URL}/dashboard")
+        + _heading("Protecting your account")
+        + _note(
+            "Astrid Global will never ask for your password or one-time codes by email or "
+            "phone. Keep your credentials private and verify the sender on every message."
+        )
+    )
+
+
+# Static blocks of each notification, rendered once at import. Templates join
+# these with the few per-message fragments instead of re-rendering them.
+_VIEW_ACCOUNT = _button("View account", f"{APP_URL}/wallet")
+
+_LOGIN_INTRO = _para("We are writing to confirm a new sign-in to your Astrid Global account.")
+_LOGIN_OUTRO = _para("If this was you, no action is required.") + _note(
+    "If you do not recognise this activity, reset your password immediately and "
+    f"contact us at {SUPPORT_EMAIL}.",
+    tone="warn",
+)
+
+_RESET_INTRO = _para(
+    "We received a request to reset the password on your Astrid Global account. "
+    "Use the button below to choose a new password."
+)
+_RESET_NOTES = (
+    _note("For your security, this link expires in 60 minutes and can be used once.", tone="warn")
+    + _para("If you did not request this, you can safely ignore this message — your password will not change.")
+    + _heading("Trouble with the button?")
+)
+
+_DEPOSIT_HEAD = _badge("Credited", "success") + _para(
+    "This confirms that the following deposit has been credited to your account."
+)
+_DEPOSIT_TAIL = _VIEW_ACCOUNT + _para(
+    "Your funds are available to invest immediately."
+)
+
+_WD_REQUEST_HEAD = _badge("Pending review", "pending") + _para(
+    "We have received your withdrawal instruction. It is now pending review by our operations team."
+)
+_WD_REQUEST_NEXT = _heading("What happens next") + _rows([
+    ("1 · Review", "Our team verifies the request (typically 1–2 business days)"),
+    ("2 · Release", "Approved funds are sent to your destination"),
+    ("3 · Confirmation", "You receive a confirmation once funds are released"),
+])
+
+_WD_APPROVED_HEAD = _badge("Approved", "success") + _para(
+    "Your withdrawal has been approved and the funds are being released to your destination."
+)
+_WD_SETTLEMENT = _heading("Expected settlement") + _rows([
+    ("Digital asset", "Typically within a few hours"),
+    ("Bank transfer", "1–3 business days"),
+])
+
+_WD_REJECTED_HEAD = _badge("Declined", "declined") + _para(
+    "We were unable to process the following withdrawal request, and no funds have left your account."
+)
+_WD_REJECTED_TAIL = _para("If you believe this was made in error, our team is ready to help.") + _button(
+    "Contact support", f"mailto:{SUPPORT_EMAIL}"
+)
+
+_TRANSFER_SENT_HEAD = _badge("Debited", "info") + _para("This confirms an internal transfer sent from your account.")
+_TRANSFER_RECEIVED_HEAD = _badge("Credited", "success") + _para("Good news — you have received an internal transfer.")
+
+_TRADE_HEAD = {
+    label: _badge(f"{label} executed", "info")
+    + _para(f"This is a confirmation that your {label.lower()} instruction has been executed in full.")
+    for label in ("Buy", "Sell")
+}
+_TRADE_TAIL = _button("View portfolio", f"{APP_URL}/trading") + _note(
+    "Please review this confirmation. Market orders fill at the prevailing price at execution."
+)
+
+_STRATEGY_SUB_BADGE = _badge("Mandate active", "success")
+_STRATEGY_SUB_TAIL = (
+    _heading("How your mandate works")
+    + _rows([
+        ("Management", "Your allocation is managed actively on your behalf"),
+        ("Performance", "Results accrue to your account and are shown in your dashboard"),
+        ("Flexibility", "You may unsubscribe at any time to release your allocation"),
+    ])
+    + _button("View strategy", f"{APP_URL}/strategies")
+    + _note(
+        "Target returns are objectives, not guarantees. The value of investments can fall "
+        "as well as rise, and you may get back less than you invested.",
+        tone="warn",
+    )
+)
+
+_STRATEGY_UNSUB_BADGE = _badge("Mandate closed", "info")
+_STRATEGY_UNSUB_TAIL = _VIEW_ACCOUNT + _note(
+    "Past performance is not indicative of future results. You may allocate to a "
+    "strategy again at any time from your portal."
+)
+
+_PASSWORD_CHANGED_HEAD = _badge("Updated", "success") + _para(
+    "This confirms that the password on your Astrid Global account was changed."
+)
+_PASSWORD_CHANGED_NOTE = _note(
+    "If you did not make this change, your account may be at risk. Reset your "
+    f"password again immediately and contact us at {SUPPORT_EMAIL}.",
+    tone="bad",
+)
+
+_COPY_BADGE = _badge("Following", "success")
+_COPY_TAIL = _button("Manage copy trading", f"{APP_URL}/copy-trading") + _note(
+    "Copy trading carries risk and past performance is not indicative of future results. "
+    "You can adjust your allocation or stop copying at any time.",
+    tone="warn",
+)
 
 
 class EmailService:
     def __init__(self):
-        pass
-
-    def _configure(self):
-        api_key = current_app.config.get('RESEND_API_KEY', os.getenv('RESEND_API_KEY', ''))
-        if api_key:
-            resend.api_key = api_key
+        # One keep-alive session to the Resend API is shared by every send so
+        # the TLS handshake is paid once, not per email.
+        self._session = None
+        self._session_lock = asyncio.Lock()
+        self._session_sends = 0
+        self._session_key = None
+        # Notifications are queued and posted in batches by a drain task that
+        # runs while the app is serving; see start()/flush().
+        self._queue = None
+        self._drain_task = None
+        self._config = None
+        # Notification helpers hand delivery off to tasks held here so the
+        # request that triggered them never waits on it.
+        self._bg = set()
+        self._log_listener = None
+        self._log_handler = None
+        # blake2b(recipient, subject, body) -> monotonic time last queued;
+        # retried requests would otherwise send the same email twice.
+        self._recent = OrderedDict()
+
+    def _get_config(self):
+        # Resolved from the app config on first use; call invalidate_config()
+        # if the settings change at runtime.
+        if self._config is None:
+            api_key = current_app.config.get('RESEND_API_KEY', os.getenv('RESEND_API_KEY', ''))
+            email_from = current_app.config.get('EMAIL_FROM', 'notifications@astridgloballtd.pro')
+            email_from_name = current_app.config.get('EMAIL_FROM_NAME', 'Astrid Global Ltd')
+            self._config = {
+                'api_key': api_key,
+                'enabled': bool(api_key),
+                # Fields shared by every message; each send only adds the
+                # recipient, subject and body.
+                'envelope': {"from": f"{email_from_name} <{email_from}>"},
+            }
+        return self._config
+
+    def invalidate_config(self):
+        self._config = None
+
+    def is_enabled(self) -> bool:
+        return self._get_config()['enabled']
+
+    async def _get_session(self, api_key: str) -> aiohttp.ClientSession:
+        async with self._session_lock:
+            if (
+                self._session is None
+                or self._session.closed
+                or self._session_sends >= MAX_SENDS_PER_SESSION
+                or self._session_key != api_key
+            ):
+                if self._session is not None and not self._session.closed:
+                    spawn(self._retire(self._session))
+                self._session = aiohttp.ClientSession(
+                    headers={
+                        "Authorization": f"Bearer {api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=75),
+                    timeout=aiohttp.ClientTimeout(total=15),
+                )
+                self._session_key = api_key
+                self._session_sends = 0
+            self._session_sends += 1
+            return self._session
+
+    @staticmethod
+    async def _retire(session: aiohttp.ClientSession):
+        # Let requests already in flight on the old session finish first.
+        await asyncio.sleep(30)
+        await session.close()
+
+    def start(self):
+        if self._log_listener is None:
+            # Records are handed to a listener thread so the event loop never
+            # blocks on writing to stdout.
+            records = queue.Queue(-1)
+            self._log_handler = logging.handlers.QueueHandler(records)
+            self._log_listener = logging.handlers.QueueListener(records, logging.StreamHandler())
+            log.addHandler(self._log_handler)
+            log.setLevel(logging.INFO)
+            log.propagate = False
+            self._log_listener.start()
+        if self._drain_task is None:
+            self._queue = asyncio.Queue()
+            self._drain_task = asyncio.create_task(self._drain())
+
+    def _fire(self, coro):
+        task = asyncio.create_task(coro)
+        self._bg.add(task)
+        task.add_done_callback(self._bg.discard)
+
+    async def flush(self):
+        """Deliver everything still queued, then stop the drain task."""
+        if self._bg:
+            await asyncio.gather(*self._bg, return_exceptions=True)
+        if self._drain_task is None:
+            return
+        await self._queue.join()
+        self._drain_task.cancel()
+        self._drain_task = None
+        self._queue = None
+
+    async def close(self):
+        async with self._session_lock:
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+            self._session = None
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            log.removeHandler(self._log_handler)
+            log.propagate = True
+            self._log_listener = None
+            self._log_handler = None
+
+    async def _post(self, api_key: str, url: str, payload):
+        # The idempotency key makes the one retry below safe even if the first
+        # attempt reached Resend before the connection dropped.
+        headers = {"Idempotency-Key": uuid.uuid4().hex}
+        for attempt in (1, 2):
+            session = await self._get_session(api_key)
+            try:
+                async with session.post(url, data=orjson.dumps(payload), headers=headers) as resp:
+                    response = await resp.json(content_type=None) or {}
+                    if resp.status >= 400:
+                        raise RuntimeError(f"Resend API {resp.status}: {response.get('message', response)}")
+                return response
+            except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError):
+                # An idle keep-alive connection can be closed by the server
+                # just as it is reused; retry once on a fresh one.
+                if attempt == 2:
+                    raise
+                log.info("Resend connection dropped, retrying")
+
+    def _is_duplicate(self, to_email: str, subject: str, html: str) -> bool:
+        key = hashlib.blake2b(f"{to_email}\0{subject}\0{html}".encode(), digest_size=16).digest()
+        now = time.monotonic()
+        seen = self._recent.get(key)
+        if seen is not None and now - seen < DEDUP_WINDOW:
             return True
+        self._recent[key] = now
+        self._recent.move_to_end(key)
+        while len(self._recent) > DEDUP_MAX:
+            self._recent.popitem(last=False)
         return False
 
-    def _get_from(self):
-        email_from = current_app.config.get('EMAIL_FROM', 'notifications@astridgloballtd.pro')
-        email_from_name = current_app.config.get('EMAIL_FROM_NAME', 'Astrid Global Ltd')
-        return f"{email_from_name} <{email_from}>"
+    async def enqueue(self, to_email: str, subject: str, html: str, dedup: bool = True):
+        """
+        Queue one message. Transactional confirmations pass dedup=False: two
+        identical trades or transfers within the window render the same
+        email, and each one must still be confirmed.
+        """
+        if not _EMAIL_RE.match(to_email or ""):
+            log.warning("Invalid email skipped: %r", to_email)
+            return
+        if dedup and self._is_duplicate(to_email, subject, html):
+            log.info("Duplicate email suppressed: %s - %s", to_email, subject)
+            return
+        if self._queue is None:
+            # Not serving (scripts, tests): deliver immediately.
+            return await self.send_email(to_email, subject, html)
+        await self._queue.put((to_email, subject, html))
+
+    async def _drain(self):
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(BATCH_DEBOUNCE)
+            while len(batch) < BATCH_MAX and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._send_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _send_batch(self, batch):
+        try:
+            config = self._get_config()
+            if not config['enabled']:
+                log.info("Email batch skipped (no RESEND_API_KEY): %d message(s)", len(batch))
+                return
+
+            envelope = config['envelope']
+            payload = [
+                {**envelope, "to": [to_email], "subject": subject, "html": html}
+                for to_email, subject, html in batch
+            ]
+            response = await self._post(config['api_key'], RESEND_BATCH_URL, payload)
+            for (to_email, _, _), sent in zip(batch, response.get('data') or []):
+                log.info("Email sent via Resend to %s (ID=%s)", to_email, sent.get('id'))
+
+        except Exception:
+            log.exception("Failed to send email batch of %d", len(batch))
 
     async def send_email(self, to_email: str, subject: str, html: str):
+        # Only reached through enqueue(), which has already validated to_email
         try:
-            if not to_email:
-                print("Email skipped (no recipient)")
-                return
-            if not self._configure():
-                print(f"Email skipped (no RESEND_API_KEY): {to_email} - {subject}")
+            config = self._get_config()
+            if not config['enabled']:
+                log.info("Email skipped (no RESEND_API_KEY): %s - %s", to_email, subject)
                 return
 
             params = {
-                "from": self._get_from(),
+                **config['envelope'],
                 "to": [to_email],
                 "subject": subject,
                 "html": html,
             }
 
-            import asyncio
-            response = await asyncio.to_thread(resend.Emails.send, params)
-            print(f"Email sent via Resend to {to_email}: {response.get('id', 'ok')}")
-            return True
+            response = await self._post(config['api_key'], RESEND_API_URL, params)
+            message_id = response.get('id')
+            log.info("Email sent via Resend to %s (ID=%s)", to_email, message_id)
+            return message_id
 
-        except Exception as e:
-            print(f"Failed to send email to {to_email}: {str(e)}")
+        except Exception:
+            log.exception("Failed to send email to %s", to_email)
 
     # ---- Onboarding -------------------------------------------------------
     async def send_welcome_email(self, email: str, name: str = None):
-        display_name = name or "Investor"
-        content = (
-            _para(f"Dear {display_name},")
-            + _para(
-                "Welcome to Astrid Global. Your account has been opened and your portal is "
-                "ready. From a single, secure dashboard you can fund your account, invest across "
-                "digital assets and equities, and follow our managed strategies."
-            )
-            + _heading("Your portal at a glance")
-            + _rows([
-                ("Fund &amp; manage", "Deposit, withdraw and transfer with full transaction records"),
-                ("Markets", "Trade crypto and equities on real-time pricing"),
-                ("Managed strategies", "Allocate to curated, risk-rated strategies"),
-                ("Oversight", "Monitor performance and statements 24/7"),
-            ])
-            + _button("Enter your portal", f"{APP_URL}/dashboard")
-            + _heading("Protecting your account")
-            + _note(
-                "Astrid Global will never ask for your password or one-time codes by email or "
-                "phone. Keep your credentials private and verify the sender on every message."
-            )
-        )
-        html = _layout("Account Opening", "Welcome to Astrid Global", content, email)
-        await self.send_email(email, "Welcome to Astrid Global — your account is open", html)
+        if not self.is_enabled():
+            return
+        html = _layout("Account Opening", "Welcome to Astrid Global", _welcome_content(_esc(name or "Investor")), email)
+        self._fire(self.enqueue(email, "Welcome to Astrid Global — your account is open", html))
 
     # ---- Security ---------------------------------------------------------
     async def send_login_notification(self, email: str, ip_address: str = "Unknown", user_agent: str = "Unknown"):
-        content = (
-            _para("We are writing to confirm a new sign-in to your Astrid Global account.")
-            + _rows([
+        if not self.is_enabled():
+            return
+        content = "".join((
+            _LOGIN_INTRO,
+            _rows([
                 ("Date &amp; time", _mono(_now_utc())),
-                ("IP address", _mono(ip_address)),
-                ("Device", user_agent),
-            ])
-            + _para("If this was you, no action is required.")
-            + _note(
-                "If you do not recognise this activity, reset your password immediately and "
-                f"contact us at {SUPPORT_EMAIL}.",
-                tone="warn",
-            )
-        )
+                ("IP address", _mono(_esc(ip_address))),
+                ("Device", _esc(user_agent)),
+            ]),
+            _LOGIN_OUTRO,
+        ))
         html = _layout("Security Notice", "New sign-in to your account", content, email)
-        await self.send_email(email, "Security notice: new sign-in to your Astrid Global account", html)
+        self._fire(self.enqueue(email, "Security notice: new sign-in to your Astrid Global account", html))
 
     async def send_password_reset_email(self, email: str, reset_token: str):
+        if not self.is_enabled():
+            return
         reset_link = f"{APP_URL}/reset-password?token={reset_token}"
-        content = (
-            _para(
-                "We received a request to reset the password on your Astrid Global account. "
-                "Use the button below to choose a new password."
-            )
-            + _button("Reset password", reset_link)
-            + _note("For your security, this link expires in 60 minutes and can be used once.", tone="warn")
-            + _para("If you did not request this, you can safely ignore this message — your password will not change.")
-            + _heading("Trouble with the button?")
-            + _para(f'Copy and paste this address into your browser:<br>{_mono(reset_link)}')
-        )
+        content = "".join((
+            _RESET_INTRO,
+            _button("Reset password", reset_link),
+            _RESET_NOTES,
+            _para(f'Copy and paste this address into your browser:<br>{_mono(reset_link)}'),
+        ))
         html = _layout("Security", "Reset your password", content, email)
-        await self.send_email(email, "Reset your Astrid Global password", html)
+        self._fire(self.enqueue(email, "Reset your Astrid Global password", html))
 
     # ---- Funding ----------------------------------------------------------
     async def send_deposit_confirmation_email(self, email: str, amount: float, new_balance: float = None):
-        content = (
-            _badge("Credited", "success")
-            + _para("This confirms that the following deposit has been credited to your account.")
-            + _amount_hero(f"${amount:,.2f}", "Amount credited")
-            + _rows(
+        if not self.is_enabled():
+            return
+        content = "".join((
+            _DEPOSIT_HEAD,
+            _amount_hero(f"${amount:,.2f}", "Amount credited"),
+            _rows(
                 [("Transaction", "Deposit"), ("Value date", _mono(_now_utc()))]
                 + ([("Available balance", f"${new_balance:,.2f}")] if new_balance is not None else [])
-            )
-            + _button("View account", f"{APP_URL}/wallet")
-            + _para("Your funds are available to invest immediately.")
-        )
+            ),
+            _DEPOSIT_TAIL,
+        ))
         html = _layout("Transaction Confirmation", "Deposit received", content, email)
-        await self.send_email(email, f"Deposit confirmation — ${amount:,.2f} credited", html)
+        self._fire(self.enqueue(email, f"Deposit confirmation — ${amount:,.2f} credited", html, dedup=False))
 
     async def send_withdrawal_request_email(self, email: str, amount: float, withdrawal_id: int, network: str = None, wallet_address: str = None):
-        content = (
-            _badge("Pending review", "pending")
-            + _para("We have received your withdrawal instruction. It is now pending review by our operations team.")
-            + _amount_hero(f"${amount:,.2f}", "Amount requested")
-            + _rows([
+        if not self.is_enabled():
+            return
+        content = "".join((
+            _WD_REQUEST_HEAD,
+            _amount_hero(f"${amount:,.2f}", "Amount requested"),
+            _rows([
                 ("Reference", _mono(_ref("WD", withdrawal_id))),
-                ("Network", network or "—"),
-                ("Destination", _mono(wallet_address or "—")),
+                ("Network", _esc(network or "—")),
+                ("Destination", _mono(_esc(wallet_address or "—"))),
                 ("Submitted", _mono(_now_utc())),
-            ])
-            + _heading("What happens next")
-            + _rows([
-                ("1 · Review", "Our team verifies the request (typically 1–2 business days)"),
-                ("2 · Release", "Approved funds are sent to your destination"),
-                ("3 · Confirmation", "You receive a confirmation once funds are released"),
-            ])
-            + _note(f"Keep reference {_ref('WD', withdrawal_id)} for any correspondence about this request.")
-        )
+            ]),
+            _WD_REQUEST_NEXT,
+            _note(f"Keep reference {_ref('WD', withdrawal_id)} for any correspondence about this request."),
+        ))
         html = _layout("Withdrawal Instruction", "Withdrawal request received", content, email)
-        await self.send_email(email, f"Withdrawal request received — ref {_ref('WD', withdrawal_id)}", html)
+        self._fire(self.enqueue(email, f"Withdrawal request received — ref {_ref('WD', withdrawal_id)}", html, dedup=False))
 
     async def send_withdrawal_approved_email(self, email: str, amount: float, withdrawal_id: int):
-        content = (
-            _badge("Approved", "success")
-            + _para("Your withdrawal has been approved and the funds are being released to your destination.")
-            + _amount_hero(f"${amount:,.2f}", "Amount released")
-            + _rows([
+        if not self.is_enabled():
+            return
+        content = "".join((
+            _WD_APPROVED_HEAD,
+            _amount_hero(f"${amount:,.2f}", "Amount released"),
+            _rows([
                 ("Reference", _mono(_ref("WD", withdrawal_id))),
                 ("Approved", _mono(_now_utc())),
-            ])
-            + _heading("Expected settlement")
-            + _rows([
-                ("Digital asset", "Typically within a few hours"),
-                ("Bank transfer", "1–3 business days"),
-            ])
-            + _note(
+            ]),
+            _WD_SETTLEMENT,
+            _note(
                 f"If funds do not arrive within the expected window, contact {SUPPORT_EMAIL} "
                 f"quoting reference {_ref('WD', withdrawal_id)}."
-            )
-        )
+            ),
+        ))
         html = _layout("Withdrawal Confirmation", "Your withdrawal has been approved", content, email)
-        await self.send_email(email, f"Withdrawal approved — ref {_ref('WD', withdrawal_id)}", html)
+        self._fire(self.enqueue(email, f"Withdrawal approved — ref {_ref('WD', withdrawal_id)}", html, dedup=False))
 
     async def send_withdrawal_rejected_email(self, email: str, amount: float, withdrawal_id: int, reason: str = None):
-        reason_text = reason or "Please contact our support team for further details."
-        content = (
-            _badge("Declined", "declined")
-            + _para("We were unable to process the following withdrawal request, and no funds have left your account.")
-            + _rows([
+        if not self.is_enabled():
+            return
+        # reason comes straight from the request JSON and may not be a string
+        reason_text = str(reason) if reason else "Please contact our support team for further details."
+        content = "".join((
+            _WD_REJECTED_HEAD,
+            _rows([
                 ("Amount", f"${amount:,.2f}"),
                 ("Reference", _mono(_ref("WD", withdrawal_id))),
-                ("Reason", reason_text),
-            ])
-            + _para("If you believe this was made in error, our team is ready to help.")
-            + _button("Contact support", f"mailto:{SUPPORT_EMAIL}")
-        )
+                ("Reason", _esc(reason_text)),
+            ]),
+            _WD_REJECTED_TAIL,
+        ))
         html = _layout("Withdrawal Update", "Withdrawal could not be processed", content, email)
-        await self.send_email(email, f"Withdrawal update — ref {_ref('WD', withdrawal_id)}", html)
+        self._fire(self.enqueue(email, f"Withdrawal update — ref {_ref('WD', withdrawal_id)}", html, dedup=False))
 
     async def send_transfer_sent_email(self, email: str, amount: float, recipient_email: str, new_balance: float = None):
-        content = (
-            _badge("Debited", "info")
-            + _para("This confirms an internal transfer sent from your account.")
-            + _amount_hero(f"-${amount:,.2f}", "Amount sent")
-            + _rows(
-                [("Recipient", recipient_email), ("Date", _mono(_now_utc()))]
+        if not self.is_enabled():
+            return
+        content = "".join((
+            _TRANSFER_SENT_HEAD,
+            _amount_hero(f"-${amount:,.2f}", "Amount sent"),
+            _rows(
+                [("Recipient", _esc(recipient_email)), ("Date", _mono(_now_utc()))]
                 + ([("Available balance", f"${new_balance:,.2f}")] if new_balance is not None else [])
-            )
-            + _button("View account", f"{APP_URL}/wallet")
-        )
+            ),
+            _VIEW_ACCOUNT,
+        ))
         html = _layout("Transfer Confirmation", "Transfer sent", content, email)
-        await self.send_email(email, f"Transfer sent — ${amount:,.2f}", html)
+        self._fire(self.enqueue(email, f"Transfer sent — ${amount:,.2f}", html, dedup=False))
 
     async def send_transfer_received_email(self, email: str, amount: float, sender_email: str = None, new_balance: float = None):
+        if not self.is_enabled():
+            return
         sender = sender_email or "another Astrid Global account"
-        content = (
-            _badge("Credited", "success")
-            + _para("Good news — you have received an internal transfer.")
-            + _amount_hero(f"+${amount:,.2f}", "Amount received")
-            + _rows(
-                [("From", sender), ("Date", _mono(_now_utc()))]
+        content = "".join((
+            _TRANSFER_RECEIVED_HEAD,
+            _amount_hero(f"+${amount:,.2f}", "Amount received"),
+            _rows(
+                [("From", _esc(sender)), ("Date", _mono(_now_utc()))]
                 + ([("Available balance", f"${new_balance:,.2f}")] if new_balance is not None else [])
-            )
-            + _button("View account", f"{APP_URL}/wallet")
-        )
+            ),
+            _VIEW_ACCOUNT,
+        ))
         html = _layout("Transfer Confirmation", "Funds received", content, email)
-        await self.send_email(email, f"Funds received — ${amount:,.2f}", html)
+        self._fire(self.enqueue(email, f"Funds received — ${amount:,.2f}", html, dedup=False))
 
     # ---- Trading ----------------------------------------------------------
     async def send_trade_executed_email(self, email: str, asset: str, side: str, size: float, price: float, total: float):
+        if not self.is_enabled():
+            return
         side_label = "Buy" if side.lower() == "buy" else "Sell"
-        content = (
-            _badge(f"{side_label} executed", "info")
-            + _para(f"This is a confirmation that your {side_label.lower()} instruction has been executed in full.")
-            + _rows([
-                ("Instrument", f"<strong>{asset}</strong>"),
+        asset_html = _esc(asset)
+        content = "".join((
+            _TRADE_HEAD[side_label],
+            _rows([
+                ("Instrument", f"<strong>{asset_html}</strong>"),
                 ("Side", side_label),
                 ("Quantity", _mono(f"{size}")),
                 ("Execution price", _mono(f"${price:,.2f}")),
-            ])
-            + _amount_hero(f"${total:,.2f}", "Gross consideration")
-            + _rows([("Executed", _mono(_now_utc()))])
-            + _button("View portfolio", f"{APP_URL}/trading")
-            + _note("Please review this confirmation. Market orders fill at the prevailing price at execution.")
-        )
-        html = _layout("Trade Confirmation", f"{side_label} order executed — {asset}", content, email)
-        await self.send_email(email, f"Trade confirmation — {side_label} {asset}", html)
+            ]),
+            _amount_hero(f"${total:,.2f}", "Gross consideration"),
+            _rows([("Executed", _mono(_now_utc()))]),
+            _TRADE_TAIL,
+        ))
+        html = _layout("Trade Confirmation", f"{side_label} order executed — {asset_html}", content, email)
+        self._fire(self.enqueue(email, f"Trade confirmation — {side_label} {asset}", html, dedup=False))
 
     async def send_strategy_subscription_email(self, email: str, strategy_name: str, invested_amount: float, expected_roi: float, risk_level: str):
-        content = (
-            _badge("Mandate active", "success")
-            + _para(f"This confirms your allocation to the <strong>{strategy_name}</strong> strategy.")
-            + _amount_hero(f"${invested_amount:,.2f}", "Amount allocated")
-            + _rows([
-                ("Strategy", strategy_name),
+        if not self.is_enabled():
+            return
+        name_html = _esc(strategy_name)
+        content = "".join((
+            _STRATEGY_SUB_BADGE,
+            _para(f"This confirms your allocation to the <strong>{name_html}</strong> strategy."),
+            _amount_hero(f"${invested_amount:,.2f}", "Amount allocated"),
+            _rows([
+                ("Strategy", name_html),
                 ("Target daily return", f"{expected_roi:.2f}%"),
-                ("Risk rating", risk_level.title()),
+                ("Risk rating", _esc(risk_level.title())),
                 ("Effective", _mono(_now_utc())),
-            ])
-            + _heading("How your mandate works")
-            + _rows([
-                ("Management", "Your allocation is managed actively on your behalf"),
-                ("Performance", "Results accrue to your account and are shown in your dashboard"),
-                ("Flexibility", "You may unsubscribe at any time to release your allocation"),
-            ])
-            + _button("View strategy", f"{APP_URL}/strategies")
-            + _note(
-                "Target returns are objectives, not guarantees. The value of investments can fall "
-                "as well as rise, and you may get back less than you invested.",
-                tone="warn",
-            )
-        )
+            ]),
+            _STRATEGY_SUB_TAIL,
+        ))
         html = _layout("Advisory Confirmation", "Strategy allocation confirmed", content, email)
-        await self.send_email(email, f"Allocation confirmed — {strategy_name}", html)
+        self._fire(self.enqueue(email, f"Allocation confirmed — {strategy_name}", html, dedup=False))
 
     async def send_strategy_unsubscribe_email(self, email: str, strategy_name: str, invested_amount: float, earnings: float, returned_amount: float):
+        if not self.is_enabled():
+            return
         gain = earnings >= 0
-        content = (
-            _badge("Mandate closed", "info")
-            + _para(f"This confirms that your allocation to the <strong>{strategy_name}</strong> strategy has been closed and released to your account.")
-            + _amount_hero(f"${returned_amount:,.2f}", "Returned to your balance")
-            + _rows([
-                ("Strategy", strategy_name),
+        name_html = _esc(strategy_name)
+        content = "".join((
+            _STRATEGY_UNSUB_BADGE,
+            _para(f"This confirms that your allocation to the <strong>{name_html}</strong> strategy has been closed and released to your account."),
+            _amount_hero(f"${returned_amount:,.2f}", "Returned to your balance"),
+            _rows([
+                ("Strategy", name_html),
                 ("Principal", f"${invested_amount:,.2f}"),
                 ("Earnings", f"{'+' if gain else '-'}${abs(earnings):,.2f}"),
                 ("Closed", _mono(_now_utc())),
-            ])
-            + _button("View account", f"{APP_URL}/wallet")
-            + _note(
-                "Past performance is not indicative of future results. You may allocate to a "
-                "strategy again at any time from your portal."
-            )
-        )
+            ]),
+            _STRATEGY_UNSUB_TAIL,
+        ))
         html = _layout("Advisory Confirmation", "Strategy allocation released", content, email)
-        await self.send_email(email, f"Allocation released — {strategy_name}", html)
+        self._fire(self.enqueue(email, f"Allocation released — {strategy_name}", html, dedup=False))
 
     async def send_password_changed_email(self, email: str):
-        content = (
-            _badge("Updated", "success")
-            + _para("This confirms that the password on your Astrid Global account was changed.")
-            + _rows([("Changed", _mono(_now_utc()))])
-            + _note(
-                "If you did not make this change, your account may be at risk. Reset your "
-                f"password again immediately and contact us at {SUPPORT_EMAIL}.",
-                tone="bad",
-            )
-        )
+        if not self.is_enabled():
+            return
+        content = "".join((
+            _PASSWORD_CHANGED_HEAD,
+            _rows([("Changed", _mono(_now_utc()))]),
+            _PASSWORD_CHANGED_NOTE,
+        ))
         html = _layout("Security", "Your password was changed", content, email)
-        await self.send_email(email, "Your Astrid Global password was changed", html)
+        self._fire(self.enqueue(email, "Your Astrid Global password was changed", html))
 
     async def send_copy_trading_email(self, email: str, trader_name: str, allocation: float):
-        content = (
-            _badge("Following", "success")
-            + _para(
-                f"This confirms that you are now copying <strong>{trader_name}</strong>. Eligible trades "
+        if not self.is_enabled():
+            return
+        trader_html = _esc(trader_name)
+        content = "".join((
+            _COPY_BADGE,
+            _para(
+                f"This confirms that you are now copying <strong>{trader_html}</strong>. Eligible trades "
                 "from this lead trader will be mirrored to your account in proportion to your allocation."
-            )
-            + _rows([
-                ("Lead trader", trader_name),
+            ),
+            _rows([
+                ("Lead trader", trader_html),
                 ("Portfolio allocation", f"{allocation:.0f}%"),
                 ("Effective", _mono(_now_utc())),
-            ])
-            + _button("Manage copy trading", f"{APP_URL}/copy-trading")
-            + _note(
-                "Copy trading carries risk and past performance is not indicative of future results. "
-                "You can adjust your allocation or stop copying at any time.",
-                tone="warn",
-            )
-        )
+            ]),
+            _COPY_TAIL,
+        ))
         html = _layout("Copy Trading", "You are now copying a lead trader", content, email)
-        await self.send_email(email, f"Copy trading active — {trader_name}", html)
+        self._fire(self.enqueue(email, f"Copy trading active — {trader_name}", html, dedup=False))
 
 
 # Global email service instance
@@ -0,0 +1,21 @@
+import orjson
+from quart.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson so ``jsonify`` serializes in C.
+
+    Types orjson does not handle natively (``Decimal``, ``UUID``, ...) still go
+    through Quart's ``default`` hook, so responses keep the same shape.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
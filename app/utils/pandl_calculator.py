@@ -17,11 +17,17 @@ This module implements sophisticated P&L calculations that incorporate:
 
 import math
 import numpy as np
+from numba import njit, prange, vectorize
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from enum import Enum
 
+# fastmath without the no-NaN/no-Inf assumptions: degenerate inputs (flat
+# prices, zero interest coverage) must still behave as the scalar code did.
+_PNL_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
 class MarketRegime(Enum):
     KEYNESIAN_RECOVERY = "keynesian_recovery"  # Government stimulus needed
     HAYEKIAN_ORDER = "hayekian_order"  # Free market signals working
@@ -30,6 +36,16 @@ class MarketRegime(Enum):
     TALEBS_BLACK_SWAN = "taleb_black_swan"  # Extreme uncertainty
     SCHUMPETER_CREATIVE_DESTRUCTION = "schumpeter_creative_destruction"  # Innovation disruption
 
+# Keynesian confidence multiplier per regime
+REGIME_MULTIPLIERS = {
+    MarketRegime.KEYNESIAN_RECOVERY: 1.2,  # Government stimulus boost
+    MarketRegime.HAYEKIAN_ORDER: 1.0,  # Natural market order
+    MarketRegime.FRIEDMAN_STAGFLATION: 0.9,  # Monetary policy drag
+    MarketRegime.MINSKY_MOMENT: 0.7,  # Financial panic discount
+    MarketRegime.TALEBS_BLACK_SWAN: 0.5,  # Extreme uncertainty penalty
+    MarketRegime.SCHUMPETER_CREATIVE_DESTRUCTION: 1.3  # Innovation premium
+}
+
 class RiskProfile(Enum):
     KEYNESIAN_RISKY = "keynesian_risky"  # High risk, high reward
     HAYEKIAN_PRUDENT = "hayekian_prudent"  # Market discipline
@@ -51,6 +67,73 @@ class TradeMetrics:
     behavioral_bias: float  # Kahneman prospect theory
     transaction_costs: float  # Coase transaction costs
 
+# Compact integer codes for MarketRegime in columnar data; the Enum's string
+# values remain what is persisted.
+REGIMES = tuple(MarketRegime)
+REGIME_CODES = {regime: code for code, regime in enumerate(REGIMES)}
+# REGIME_MULTIPLIERS as a lookup table indexed by regime code
+REGIME_MULT_LUT = np.array([REGIME_MULTIPLIERS[r] for r in REGIMES], dtype=np.float64)
+
+# Score columns are bounded, hand-tuned weights; single precision is plenty
+# and halves the memory the batch kernels stream through
+SCORE_DTYPE = np.float32
+
+@dataclass
+class TradeBatch:
+    """Many TradeMetrics stored column-wise (one array per field) for batch P&L"""
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    position_size: np.ndarray
+    holding_period: np.ndarray  # int32 hours
+    volatility_at_entry: np.ndarray
+    market_regime: np.ndarray  # int8 codes into REGIMES
+    momentum_score: np.ndarray  # float32 scores
+    technical_score: np.ndarray
+    fundamental_score: np.ndarray
+    behavioral_bias: np.ndarray
+    transaction_costs: np.ndarray
+
+    def __len__(self) -> int:
+        return self.entry_price.size
+
+    @classmethod
+    def from_trade_metrics(cls, trades: List[TradeMetrics]) -> 'TradeBatch':
+        def column(name, dtype=np.float64):
+            return np.fromiter((getattr(t, name) for t in trades), dtype=dtype, count=len(trades))
+
+        return cls(
+            entry_price=column('entry_price'),
+            exit_price=column('exit_price'),
+            position_size=column('position_size'),
+            holding_period=column('holding_period', np.int32),
+            volatility_at_entry=column('volatility_at_entry'),
+            market_regime=np.fromiter((REGIME_CODES[t.market_regime] for t in trades),
+                                      dtype=np.int8, count=len(trades)),
+            momentum_score=column('momentum_score', SCORE_DTYPE),
+            technical_score=column('technical_score', SCORE_DTYPE),
+            fundamental_score=column('fundamental_score', SCORE_DTYPE),
+            behavioral_bias=column('behavioral_bias', SCORE_DTYPE),
+            transaction_costs=column('transaction_costs'),
+        )
+
+    def to_records(self) -> List[TradeMetrics]:
+        return [
+            TradeMetrics(
+                entry_price=float(self.entry_price[i]),
+                exit_price=float(self.exit_price[i]),
+                position_size=float(self.position_size[i]),
+                holding_period=int(self.holding_period[i]),
+                volatility_at_entry=float(self.volatility_at_entry[i]),
+                market_regime=REGIMES[self.market_regime[i]],
+                momentum_score=float(self.momentum_score[i]),
+                technical_score=float(self.technical_score[i]),
+                fundamental_score=float(self.fundamental_score[i]),
+                behavioral_bias=float(self.behavioral_bias[i]),
+                transaction_costs=float(self.transaction_costs[i]),
+            )
+            for i in range(len(self))
+        ]
+
 @dataclass
 class StrategyPerformance:
     """Comprehensive performance metrics from multiple economic schools"""
@@ -84,21 +167,10 @@ class KeynesianInterventions:
         """
         Keynesian confidence multiplier during different market regimes
         """
-        base_multiplier = 1.0
-
-        regime_multipliers = {
-            MarketRegime.KEYNESIAN_RECOVERY: 1.2,  # Government stimulus boost
-            MarketRegime.HAYEKIAN_ORDER: 1.0,  # Natural market order
-            MarketRegime.FRIEDMAN_STAGFLATION: 0.9,  # Monetary policy drag
-            MarketRegime.MINSKY_MOMENT: 0.7,  # Financial panic discount
-            MarketRegime.TALEBS_BLACK_SWAN: 0.5,  # Extreme uncertainty penalty
-            MarketRegime.SCHUMPETER_CREATIVE_DESTRUCTION: 1.3  # Innovation premium
-        }
-
         # Economic cycle adjustment (0-1 scale, 0=depression, 1=boom)
         cycle_adjustment = 1 + (economic_cycle_position - 0.5) * 0.4
 
-        return regime_multipliers[market_regime] * cycle_adjustment
+        return REGIME_MULTIPLIERS[market_regime] * cycle_adjustment
 
     @staticmethod
     def apply_fiscal_multiplier(economic_output: float, government_spending: float) -> float:
@@ -156,6 +228,7 @@ class FriedmanMonetaristFramework:
     """
 
     @staticmethod
+    @vectorize(['f8(f8, f8)'], nopython=True, fastmath=_PNL_FASTMATH, cache=True)
     def calculate_monetary_neutrality_adjustment(money_supply_growth: float,
                                                inflation_expectations: float) -> float:
         """
@@ -189,19 +262,19 @@ class KahnemanBehavioralEconomics:
     """
 
     @staticmethod
+    @vectorize(['f8(f8, f8)'], nopython=True, fastmath=_PNL_FASTMATH, cache=True)
     def calculate_loss_aversion_impact(gains: float, losses: float) -> float:
         """
         Prospect theory: losses hurt more than gains help
         Loss aversion coefficient ≈ 2.25
         """
-        if losses == 0:
-            return 1.0
-
         loss_aversion_coefficient = 2.25
         behavioral_impact = (gains * 1) + (losses * loss_aversion_coefficient)
 
-        # Convert to multiplier
-        return 1 + (behavioral_impact / (abs(gains) + abs(losses) + 1)) * 0.2
+        # Convert to multiplier; no losses means no adjustment. Masking instead
+        # of returning early keeps the ufunc loop branch-free (the denominator
+        # is always >= 1).
+        return 1 + (losses != 0) * (behavioral_impact / (abs(gains) + abs(losses) + 1)) * 0.2
 
     @staticmethod
     def apply_anchoring_bias_correction(anchor_price: float,
@@ -224,6 +297,7 @@ class MinskyFinancialInstability:
     """
 
     @staticmethod
+    @vectorize(['f8(f8, f8, f8)'], nopython=True, fastmath=_PNL_FASTMATH, cache=True)
     def calculate_financial_fragility_index(debt_to_equity: float,
                                           interest_coverage: float,
                                           cash_flow_volatility: float) -> float:
@@ -263,10 +337,11 @@ class TalebBlackSwanTheory:
         if len(returns) < 10:
             return 0.5
 
-        # 5% tail risk (VaR-like measure)
-        sorted_returns = sorted(returns)
-        tail_index = int(len(returns) * 0.05)
-        fifth_percentile = sorted_returns[tail_index]
+        # 5% tail risk (VaR-like measure); only one order statistic is
+        # needed, so select it in O(n) rather than sorting
+        arr = np.asarray(returns, dtype=np.float64)
+        tail_index = int(arr.size * 0.05)
+        fifth_percentile = float(np.partition(arr, tail_index)[tail_index])
 
         # 95% confidence VaR
         tail_risk = abs(fifth_percentile)
@@ -291,6 +366,7 @@ class SchumpeterCreativeDestruction:
     """
 
     @staticmethod
+    @vectorize(['f8(f8, f8)'], nopython=True, fastmath=_PNL_FASTMATH, cache=True)
     def calculate_innovation_premium(innovation_index: float,
                                    disruption_potential: float) -> float:
         """
@@ -322,6 +398,7 @@ class BeckerHumanCapital:
     """
 
     @staticmethod
+    @vectorize(['f8(f8, f8, f8)'], nopython=True, fastmath=_PNL_FASTMATH, cache=True)
     def calculate_human_capital_roi(education_years: float,
                                   experience_years: float,
                                   skill_development: float) -> float:
@@ -346,6 +423,26 @@ class BeckerHumanCapital:
 
         return 1 - efficiency_penalty
 
+@njit(cache=True, fastmath=_PNL_FASTMATH)
+def _regime_features(prices, volumes):
+    """Trend strength, return volatility and volume confirmation for regime detection."""
+    # Calculate trend strength over the most recent window
+    recent_prices = prices[-10:]
+    price_trend = (recent_prices[-1] - recent_prices[0]) / recent_prices[0]
+
+    # Calculate volatility
+    returns = recent_prices[1:] / recent_prices[:-1] - 1.0
+    volatility = returns.std() if returns.size > 0 else 0.0
+
+    # Volume confirmation
+    volume_ratio = 1.0
+    if volumes.size > 0:
+        avg_volume = volumes.mean()
+        if avg_volume > 0:
+            volume_ratio = volumes[-1] / avg_volume
+
+    return price_trend, volatility, volume_ratio
+
 class ChineseQuantitativeAnalysis:
     """
     Chinese quantitative methods for market regime analysis
@@ -353,25 +450,16 @@ class ChineseQuantitativeAnalysis:
     """
 
     @staticmethod
-    def calculate_market_regime(prices: List[float], volumes: List[float]) -> MarketRegime:
+    def calculate_market_regime(prices, volumes) -> MarketRegime:
         """
         Determine market regime using technical analysis
         """
-        if len(prices) < 5:
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        if prices.size < 5:
             return MarketRegime.HAYEKIAN_ORDER
 
-        # Calculate trend strength
-        recent_prices = prices[-10:] if len(prices) >= 10 else prices
-        price_trend = (recent_prices[-1] - recent_prices[0]) / recent_prices[0]
-
-        # Calculate volatility
-        returns = [recent_prices[i]/recent_prices[i-1] - 1 for i in range(1, len(recent_prices))]
-        volatility = np.std(returns) if returns else 0
-
-        # Volume confirmation
-        avg_volume = np.mean(volumes) if volumes else 1
-        recent_volume = volumes[-1] if volumes else 1
-        volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1
+        price_trend, volatility, volume_ratio = _regime_features(prices, volumes)
 
         # Regime determination logic
         if price_trend > 0.05 and volatility > 0.03 and volume_ratio > 1.2:
@@ -394,6 +482,7 @@ class CoaseTransactionCosts:
     """
 
     @staticmethod
+    @vectorize(['f8(f8, f8, f8)'], nopython=True, fastmath=_PNL_FASTMATH, cache=True)
     def calculate_transaction_cost_efficiency(search_costs: float,
                                            bargaining_costs: float,
                                            enforcement_costs: float) -> float:
@@ -423,23 +512,226 @@ class CoaseTransactionCosts:
         else:
             return "hybrid"
 
+# The schools' helpers are stateless; bind the ones the calculator and the
+# routes use as plain module-level functions
+keynesian_market_confidence_multiplier = KeynesianInterventions.calculate_market_confidence_multiplier
+hayek_information_efficiency = HayekianInformationTheory.calculate_information_efficiency
+friedman_monetary_neutrality = FriedmanMonetaristFramework.calculate_monetary_neutrality_adjustment
+kahneman_loss_aversion = KahnemanBehavioralEconomics.calculate_loss_aversion_impact
+minsky_financial_fragility = MinskyFinancialInstability.calculate_financial_fragility_index
+taleb_tail_risk = TalebBlackSwanTheory.calculate_tail_risk_exposure
+schumpeter_innovation_premium = SchumpeterCreativeDestruction.calculate_innovation_premium
+becker_human_capital_roi = BeckerHumanCapital.calculate_human_capital_roi
+coase_transaction_efficiency = CoaseTransactionCosts.calculate_transaction_cost_efficiency
+chinese_market_regime = ChineseQuantitativeAnalysis.calculate_market_regime
+
+# exp(-0.001 * hours) for every whole-hour holding period up to ~5.7 years
+TIME_DECAY_HOURS = 50000
+TIME_DECAY_LUT = np.exp(-np.arange(TIME_DECAY_HOURS, dtype=np.float64) * 0.001)
+
+def _time_decay(holding_period) -> float:
+    """Holding period adjustment (time value of money)"""
+    if isinstance(holding_period, (int, np.integer)) and 0 <= holding_period < TIME_DECAY_HOURS:
+        return float(TIME_DECAY_LUT[holding_period])
+    return math.exp(-holding_period * 0.001)
+
+@njit(cache=True, fastmath=_PNL_FASTMATH, error_model='numpy')
+def _information_kernel(price_changes, volume_changes):
+    """Hayekian information efficiency, as calculate_information_efficiency."""
+    n = price_changes.size
+    if n < 2:
+        return 0.5
+    paired = volume_changes.size == n
+
+    # Means of both series in one pass, then the centred moments in a
+    # second: std and the Pearson r (np.corrcoef would need BLAS here)
+    # without materialising deviation arrays.
+    price_sum = 0.0
+    volume_sum = 0.0
+    for i in range(n):
+        price_sum += price_changes[i]
+        if paired:
+            volume_sum += volume_changes[i]
+    price_mean = price_sum / n
+    volume_mean = volume_sum / n
+
+    ss_price = 0.0
+    ss_volume = 0.0
+    cross = 0.0
+    for i in range(n):
+        dp = price_changes[i] - price_mean
+        ss_price += dp * dp
+        if paired:
+            dv = volume_changes[i] - volume_mean
+            ss_volume += dv * dv
+            cross += dp * dv
+
+    volume_correlation = 0.0
+    if paired:
+        volume_correlation = cross / np.sqrt(ss_price * ss_volume)
+        if volume_correlation > 1.0:
+            volume_correlation = 1.0
+        elif volume_correlation < -1.0:
+            volume_correlation = -1.0
+    information = 1 - (np.sqrt(ss_price / n) / (abs(price_mean) + 1)) + volume_correlation * 0.3
+    if information != information:
+        return 1.0  # min(1, nan) in the scalar version
+    return max(0.0, min(1.0, information))
+
+@lru_cache(maxsize=256)
+def _cached_information(price_bytes: bytes, volume_bytes: bytes) -> float:
+    return float(_information_kernel(np.frombuffer(price_bytes), np.frombuffer(volume_bytes)))
+
+_NO_HISTORY = np.empty(0)
+
+def _information_efficiency(price_changes, volume_changes) -> float:
+    """
+    Information efficiency memoized on the market data itself, so trades
+    priced against the same price/volume history reduce it only once.
+    """
+    return _cached_information(np.asarray(price_changes, dtype=np.float64).tobytes(),
+                               np.asarray(volume_changes, dtype=np.float64).tobytes())
+
+@njit(cache=True, fastmath=_PNL_FASTMATH, error_model='numpy')
+def _composite_pnl_kernel(basic_pnl, time_decay, momentum, technical, fundamental,
+                          tx_cost, cycle_pos, regime_mult, information, money_growth,
+                          inflation_exp, debt_eq, int_cov, cf_vol, edu_yrs, exp_yrs,
+                          historical_returns):
+    """All school adjustments of calculate_comprehensive_pnl in one compiled pass."""
+    # Keynesian confidence
+    keynesian = regime_mult * (1 + (cycle_pos - 0.5) * 0.4)
+
+    # Friedman monetary neutrality
+    monetary = max(0.8, min(1.2, 1 + (money_growth - inflation_exp) * 0.1))
+
+    # Kahneman loss aversion
+    gains = max(0.0, basic_pnl)
+    losses = max(0.0, -basic_pnl)
+    behavioral = 1 + (losses != 0) * ((gains + losses * 2.25) / (abs(gains) + abs(losses) + 1)) * 0.2
+
+    # Minsky financial fragility
+    fragility = max(0.3, 1 / (1 + debt_eq * 0.4 + (1 / int_cov) * 0.3 + cf_vol * 0.3))
+
+    # Taleb tail risk
+    if historical_returns.size < 10:
+        tail_risk = 0.5
+    else:
+        k = int(historical_returns.size * 0.05)
+        tail_risk = abs(np.partition(historical_returns, k)[k])
+
+    # Schumpeter innovation premium
+    innovation = min(2.0, 1 + momentum * 0.3 + technical * 0.2)
+
+    # Becker human capital
+    human_capital = 1 + edu_yrs * 0.08 + exp_yrs * 0.03 + fundamental * 0.05
+
+    # Coase transaction costs; search + bargaining (0.5x) + enforcement (0.3x)
+    transaction = max(0.5, 1 / (1 + 1.8 * tx_cost))
+
+    composite = (
+        keynesian * 0.15 +
+        information * 0.15 +
+        monetary * 0.1 +
+        behavioral * 0.1 +
+        fragility * 0.15 +
+        (1 / (1 + tail_risk)) * 0.1 +  # Inverse tail risk
+        innovation * 0.1 +
+        human_capital * 0.05 +
+        transaction * 0.1
+    )
+
+    final_pnl = basic_pnl * composite * time_decay
+
+    return (final_pnl, keynesian, information, monetary, behavioral, fragility, tail_risk,
+            innovation, human_capital, transaction, composite, time_decay)
+
+@njit(cache=True, fastmath=_PNL_FASTMATH)
+def _dd_ulcer(returns):
+    """Max drawdown and Ulcer index (RMS drawdown) of the equity curve, one pass."""
+    cumulative = 1.0
+    peak = 1.0
+    max_dd = 0.0
+    sum_sq = 0.0
+    for r in returns:
+        cumulative *= 1.0 + r
+        if cumulative > peak:
+            peak = cumulative
+        dd = (peak - cumulative) / peak
+        if dd > max_dd:
+            max_dd = dd
+        sum_sq += dd * dd
+    return max_dd, np.sqrt(sum_sq / returns.size)
+
+@njit(parallel=True, cache=True)
+def _strategy_stats_kernel(returns_matrix, risk_free_rate):
+    """
+    Per-row reductions behind calculate_strategy_performance_economics.
+    Rows are independent, so each prange iteration only writes its own row;
+    columns are total, volatility, downside deviation, downside sum, upside
+    sum, upside count, gross loss, downside count, max drawdown, ulcer index
+    and tail ratio.
+    """
+    m, n = returns_matrix.shape
+    out = np.zeros((m, 11))
+    if n == 0:
+        return out
+    for s in prange(m):
+        r = returns_matrix[s]
+
+        total_return = 0.0
+        for x in r:
+            total_return += x
+        mean = total_return / n
+        var_sum = 0.0
+        downside_sq = 0.0
+        downside_sum = 0.0
+        n_downside = 0
+        upside_sum = 0.0
+        n_upside = 0
+        gross_loss = 0.0
+        for x in r:
+            var_sum += (x - mean) * (x - mean)
+            if x < risk_free_rate:
+                downside_sq += x * x
+                downside_sum += x
+                n_downside += 1
+            if x > 0:
+                upside_sum += x
+                n_upside += 1
+            elif x < 0:
+                gross_loss -= x
+
+        max_dd, ulcer_index = _dd_ulcer(r)
+
+        if n >= 20:
+            k5 = int(n * 0.05)
+            k95 = int(n * 0.95)
+            partitioned = np.partition(r, k95)
+            percentile_95 = partitioned[k95]
+            percentile_5 = np.partition(partitioned[:k95], k5)[k5]
+            tail_ratio = percentile_95 / abs(percentile_5) if percentile_5 != 0 else 0.0
+        else:
+            tail_ratio = 1.0
+
+        row = out[s]
+        row[0] = total_return
+        row[1] = np.sqrt(var_sum / n)
+        row[2] = np.sqrt(downside_sq / n_downside) if n_downside else 0.0
+        row[3] = downside_sum
+        row[4] = upside_sum
+        row[5] = n_upside
+        row[6] = gross_loss
+        row[7] = n_downside
+        row[8] = max_dd
+        row[9] = ulcer_index
+        row[10] = tail_ratio
+    return out
+
 class AdvancedEconomicCalculator:
     """
     Master calculator integrating insights from top economists
     """
 
-    def __init__(self):
-        self.keynes = KeynesianInterventions()
-        self.hayek = HayekianInformationTheory()
-        self.friedman = FriedmanMonetaristFramework()
-        self.kahneman = KahnemanBehavioralEconomics()
-        self.minsky = MinskyFinancialInstability()
-        self.taleb = TalebBlackSwanTheory()
-        self.schumpeter = SchumpeterCreativeDestruction()
-        self.becker = BeckerHumanCapital()
-        self.coase = CoaseTransactionCosts()
-        self.chinese_calc = ChineseQuantitativeAnalysis()
-
     def calculate_comprehensive_pnl(self, trade_metrics: TradeMetrics,
                                    market_data: Dict,
                                    economic_context: Dict) -> Dict[str, float]:
@@ -449,62 +741,109 @@ class AdvancedEconomicCalculator:
         # Base P&L calculation
         basic_pnl = (trade_metrics.exit_price - trade_metrics.entry_price) * trade_metrics.position_size
 
-        # Keynesian interventions
-        keynesian_multiplier = self.keynes.calculate_market_confidence_multiplier(
-            trade_metrics.market_regime,
-            economic_context.get('economic_cycle_position', 0.5)
+        # Too little market history (e.g. the first trade of the day) pins
+        # information efficiency and tail risk at 0.5; skip converting and
+        # hashing the arrays on that path
+        price_changes = market_data.get('price_changes', [])
+        if len(price_changes) < 2:
+            information_efficiency = 0.5
+        else:
+            information_efficiency = _information_efficiency(price_changes,
+                                                             market_data.get('volume_changes', []))
+        historical_returns = market_data.get('historical_returns', [])
+        if len(historical_returns) < 10:
+            historical_returns = _NO_HISTORY
+        else:
+            historical_returns = np.asarray(historical_returns, dtype=np.float64)
+
+        (final_pnl, keynesian_multiplier, information_efficiency, monetary_adjustment,
+         behavioral_impact, financial_fragility, tail_risk, innovation_premium,
+         human_capital_roi, transaction_efficiency, composite_multiplier,
+         time_decay) = _composite_pnl_kernel(
+            float(basic_pnl),
+            _time_decay(trade_metrics.holding_period),
+            float(trade_metrics.momentum_score),
+            float(trade_metrics.technical_score),
+            float(trade_metrics.fundamental_score),
+            float(trade_metrics.transaction_costs),
+            float(economic_context.get('economic_cycle_position', 0.5)),
+            REGIME_MULTIPLIERS[trade_metrics.market_regime],
+            information_efficiency,
+            float(economic_context.get('money_supply_growth', 0.02)),
+            float(economic_context.get('inflation_expectations', 0.02)),
+            float(economic_context.get('debt_to_equity', 1.0)),
+            float(economic_context.get('interest_coverage', 5.0)),
+            float(economic_context.get('cash_flow_volatility', 0.1)),
+            float(economic_context.get('education_years', 16)),
+            float(economic_context.get('experience_years', 5)),
+            historical_returns,
         )
 
-        # Hayekian information efficiency
-        information_efficiency = self.hayek.calculate_information_efficiency(
+        return {
+            'basic_pnl': basic_pnl,
+            'final_pnl': final_pnl,
+            'keynesian_multiplier': keynesian_multiplier,
+            'information_efficiency': information_efficiency,
+            'monetary_adjustment': monetary_adjustment,
+            'behavioral_impact': behavioral_impact,
+            'financial_fragility': financial_fragility,
+            'tail_risk': tail_risk,
+            'innovation_premium': innovation_premium,
+            'human_capital_roi': human_capital_roi,
+            'transaction_efficiency': transaction_efficiency,
+            'composite_multiplier': composite_multiplier,
+            'time_decay': time_decay
+        }
+
+    def calculate_comprehensive_pnl_batch(self, trades: TradeBatch,
+                                         market_data: Dict,
+                                         economic_context: Dict) -> Dict[str, np.ndarray]:
+        """
+        calculate_comprehensive_pnl over many trades sharing one market and
+        economic context; each factor is one ufunc pass over the columns.
+        """
+        momentum = trades.momentum_score
+        technical = trades.technical_score
+        fundamental = trades.fundamental_score
+        tx_costs = trades.transaction_costs
+
+        basic_pnl = (trades.exit_price - trades.entry_price) * trades.position_size
+
+        regime_mult = REGIME_MULT_LUT[trades.market_regime]
+        keynesian_multiplier = regime_mult * (1 + (economic_context.get('economic_cycle_position', 0.5) - 0.5) * 0.4)
+
+        # Context-level factors are shared by every trade in the batch
+        information_efficiency = _information_efficiency(
             market_data.get('price_changes', []),
             market_data.get('volume_changes', [])
         )
-
-        # Friedman monetary neutrality
-        monetary_adjustment = self.friedman.calculate_monetary_neutrality_adjustment(
+        monetary_adjustment = friedman_monetary_neutrality(
             economic_context.get('money_supply_growth', 0.02),
             economic_context.get('inflation_expectations', 0.02)
         )
-
-        # Kahneman behavioral biases
-        behavioral_impact = self.kahneman.calculate_loss_aversion_impact(
-            max(0, basic_pnl), max(0, -basic_pnl)
-        )
-
-        # Minsky financial stability
-        financial_fragility = self.minsky.calculate_financial_fragility_index(
+        financial_fragility = minsky_financial_fragility(
             economic_context.get('debt_to_equity', 1.0),
             economic_context.get('interest_coverage', 5.0),
             economic_context.get('cash_flow_volatility', 0.1)
         )
-
-        # Taleb tail risk
-        tail_risk = self.taleb.calculate_tail_risk_exposure(
+        tail_risk = taleb_tail_risk(
             market_data.get('historical_returns', [])
         )
 
-        # Schumpeter innovation premium
-        innovation_premium = self.schumpeter.calculate_innovation_premium(
-            trade_metrics.momentum_score,
-            trade_metrics.technical_score
+        # Per-trade factors
+        behavioral_impact = kahneman_loss_aversion(
+            np.maximum(0, basic_pnl), np.maximum(0, -basic_pnl)
         )
-
-        # Becker human capital
-        human_capital_roi = self.becker.calculate_human_capital_roi(
+        innovation_premium = schumpeter_innovation_premium(momentum, technical)
+        human_capital_roi = becker_human_capital_roi(
             economic_context.get('education_years', 16),
             economic_context.get('experience_years', 5),
-            trade_metrics.fundamental_score
-        )
-
-        # Coase transaction costs
-        transaction_efficiency = self.coase.calculate_transaction_cost_efficiency(
-            trade_metrics.transaction_costs,
-            trade_metrics.transaction_costs * 0.5,
-            trade_metrics.transaction_costs * 0.3
+            fundamental
         )
+        # Coase efficiency with bargaining = 0.5x and enforcement = 0.3x the
+        # search cost, folded into one broadcast pass over the column
+        transaction_efficiency = np.maximum(0.5, 1.0 / (1.0 + 1.8 * tx_costs))
 
-        # Composite multiplier
         composite_multiplier = (
             keynesian_multiplier * 0.15 +
             information_efficiency * 0.15 +
@@ -515,14 +854,14 @@ class AdvancedEconomicCalculator:
             innovation_premium * 0.1 +
             human_capital_roi * 0.05 +
             transaction_efficiency * 0.1
-        )
-
-        # Final P&L calculation
-        adjusted_pnl = basic_pnl * composite_multiplier
+        ).astype(np.float64, copy=False)  # accounting stays in double precision
 
-        # Holding period adjustment (time value of money)
-        time_decay = math.exp(-trade_metrics.holding_period * 0.001)
-        final_pnl = adjusted_pnl * time_decay
+        holding_period = trades.holding_period
+        time_decay = TIME_DECAY_LUT[np.clip(holding_period, 0, TIME_DECAY_HOURS - 1)]
+        outside = (holding_period < 0) | (holding_period >= TIME_DECAY_HOURS)
+        if outside.any():
+            time_decay[outside] = np.exp(-holding_period[outside] * 0.001)
+        final_pnl = basic_pnl * composite_multiplier * time_decay
 
         return {
             'basic_pnl': basic_pnl,
@@ -546,71 +885,60 @@ class AdvancedEconomicCalculator:
         """
         Strategy performance using insights from top economists
         """
-        if not returns:
-            return StrategyPerformance(*[0] * 20)
+        r = np.asarray(returns, dtype=np.float64)
+        n = r.size
+        if n == 0:
+            return StrategyPerformance(*[0.0] * len(fields(StrategyPerformance)))
 
         # Basic metrics
-        total_return = sum(returns)
+        total_return = float(r.sum())
         annualized_return = total_return * (365 / max(1, economic_context.get('time_period_days', 365)))
 
         # Volatility with Taleb black swan considerations
-        volatility = math.sqrt(sum((r - total_return/len(returns))**2 for r in returns) / len(returns))
-        tail_risk = self.taleb.calculate_tail_risk_exposure(returns)
+        volatility = float(r.std())
 
         # Sharpe ratio (Sharpe)
         risk_free_rate = economic_context.get('risk_free_rate', 0.02)
         sharpe_ratio = (annualized_return - risk_free_rate) / volatility if volatility > 0 else 0
 
         # Sortino ratio (focus on downside volatility)
-        downside_returns = [r for r in returns if r < risk_free_rate]
-        downside_deviation = math.sqrt(sum(r**2 for r in downside_returns) / len(downside_returns)) if downside_returns else 0
+        downside_returns = r[r < risk_free_rate]
+        downside_deviation = float(np.sqrt(np.mean(np.square(downside_returns)))) if downside_returns.size else 0
         sortino_ratio = (annualized_return - risk_free_rate) / downside_deviation if downside_deviation > 0 else 0
 
-        # Maximum drawdown
-        cumulative = [1]
-        max_dd = 0
-        peak = 1
-
-        for r in returns:
-            cumulative_val = cumulative[-1] * (1 + r)
-            cumulative.append(cumulative_val)
-
-            if cumulative_val > peak:
-                peak = cumulative_val
-
-            dd = (peak - cumulative_val) / peak
-            max_dd = max(max_dd, dd)
+        # Maximum drawdown and Ulcer index on the equity curve, starting from 1
+        max_dd, ulcer_index = _dd_ulcer(r)
+        max_dd = float(max_dd)
+        ulcer_index = float(ulcer_index)
 
         calmar_ratio = annualized_return / max_dd if max_dd > 0 else 0
 
         # Omega ratio (Shadwick & Keating) - bounded to prevent infinity
-        upside_returns = [r for r in returns if r > 0]
-        downside_sum = abs(sum(downside_returns)) if downside_returns else 0
-        upside_sum = sum(upside_returns) if upside_returns else 0
+        upside_returns = r[r > 0]
+        downside_sum = abs(float(downside_returns.sum()))
+        upside_sum = float(upside_returns.sum())
         omega_ratio = upside_sum / downside_sum if downside_sum > 0 else 999.99  # Cap at reasonable max
 
         # Win rate and profit factor - bounded to prevent infinity
-        win_rate = len([r for r in returns if r > 0]) / len(returns) * 100
-        gross_profit = sum(r for r in returns if r > 0)
-        gross_loss = abs(sum(r for r in returns if r < 0))
+        win_rate = upside_returns.size / n * 100
+        gross_profit = upside_sum
+        gross_loss = abs(float(r[r < 0].sum()))
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else 999.99  # Cap at reasonable max
 
         # Expectancy (Kahneman behavioral considerations)
-        avg_win = gross_profit / len(upside_returns) if upside_returns else 0
-        avg_loss = gross_loss / len(downside_returns) if downside_returns else 0
+        avg_win = gross_profit / upside_returns.size if upside_returns.size else 0
+        avg_loss = gross_loss / downside_returns.size if downside_returns.size else 0
         expectancy = (avg_win * win_rate/100) - (avg_loss * (100-win_rate)/100)
 
         # Recovery factor (Minsky)
         recovery_factor = total_return / max_dd if max_dd > 0 else 0
 
-        # Ulcer index (behavioral risk measure)
-        ulcer_index = math.sqrt(sum(dd**2 for dd in [max_dd] * len(returns)) / len(returns))
-
         # Tail ratio (Taleb)
-        sorted_returns = sorted(returns)
-        if len(sorted_returns) >= 20:
-            percentile_95 = sorted_returns[int(len(sorted_returns) * 0.95)]
-            percentile_5 = sorted_returns[int(len(sorted_returns) * 0.05)]
+        if n >= 20:
+            k5, k95 = int(n * 0.05), int(n * 0.95)
+            partitioned = np.partition(r, (k5, k95))
+            percentile_95 = float(partitioned[k95])
+            percentile_5 = float(partitioned[k5])
             tail_ratio = percentile_95 / abs(percentile_5) if percentile_5 != 0 else 0
         else:
             tail_ratio = 1.0
@@ -645,5 +973,80 @@ class AdvancedEconomicCalculator:
             beta=beta
         )
 
+    def calculate_strategy_performance_batch(self, returns_matrix: np.ndarray,
+                                             invested_amount: float,
+                                             economic_context: Dict) -> List[StrategyPerformance]:
+        """
+        calculate_strategy_performance_economics over many equal-length
+        return series (one per row), computed in parallel across rows
+        """
+        returns_matrix = np.ascontiguousarray(returns_matrix, dtype=np.float64)
+        m, n = returns_matrix.shape
+        if n == 0:
+            return [StrategyPerformance(*[0.0] * len(fields(StrategyPerformance))) for _ in range(m)]
+
+        risk_free_rate = economic_context.get('risk_free_rate', 0.02)
+        (total_return, volatility, downside_deviation, downside_sum, upside_sum,
+         n_upside, gross_loss, n_downside, max_dd, ulcer_index,
+         tail_ratio) = _strategy_stats_kernel(returns_matrix, float(risk_free_rate)).T
+
+        # Ratios over whole columns; `where` keeps the scalar fallbacks
+        # (0, or the 999.99 cap) without per-strategy branching
+        def ratio(num, den, mask, fallback=0.0):
+            return np.divide(num, den, out=np.full(m, fallback), where=mask)
+
+        annualized_return = total_return * (365 / max(1, economic_context.get('time_period_days', 365)))
+        excess_return = annualized_return - risk_free_rate
+        sharpe_ratio = ratio(excess_return, volatility, volatility > 0)
+        sortino_ratio = ratio(excess_return, downside_deviation, downside_deviation > 0)
+        calmar_ratio = ratio(annualized_return, max_dd, max_dd > 0)
+        omega_ratio = ratio(upside_sum, np.abs(downside_sum), downside_sum != 0, 999.99)
+
+        win_rate = n_upside / n * 100
+        profit_factor = ratio(upside_sum, gross_loss, gross_loss > 0, 999.99)
+        avg_win = ratio(upside_sum, n_upside, n_upside > 0)
+        avg_loss = ratio(gross_loss, n_downside, n_downside > 0)
+        expectancy = (avg_win * win_rate/100) - (avg_loss * (100-win_rate)/100)
+        recovery_factor = ratio(total_return, max_dd, max_dd > 0)
+
+        benchmark_return = economic_context.get('benchmark_return', annualized_return * 0.8)
+        tracking_error = volatility * 0.8
+        information_ratio = ratio(annualized_return - benchmark_return, tracking_error, tracking_error > 0)
+
+        beta = economic_context.get('market_beta', 1.0)
+        market_return = economic_context.get('market_return', annualized_return * 0.9)
+        alpha = annualized_return - (risk_free_rate + beta * (market_return - risk_free_rate))
+
+        out = np.column_stack((
+            total_return, annualized_return, volatility, sharpe_ratio, sortino_ratio,
+            max_dd, calmar_ratio, omega_ratio, win_rate, profit_factor, expectancy,
+            recovery_factor, ulcer_index, tail_ratio, information_ratio, alpha,
+            np.full(m, beta),
+        ))
+        return [StrategyPerformance(*row) for row in out.tolist()]
+
 # Global instance for use across the application
 economic_calculator = AdvancedEconomicCalculator()
+
+def warm_kernels():
+    """
+    Compile (or load from the on-disk cache) the jitted kernels behind the
+    request paths. Numba compiles on first call, which would otherwise stall
+    the event loop inside the first trade's transaction for several seconds.
+    Called from a worker thread at start-up.
+    """
+    prices = np.linspace(100.0, 101.0, 24)
+    volumes = np.full(24, 1000.0)
+    returns = np.diff(prices) / prices[:-1]
+    chinese_market_regime(prices, volumes)
+    economic_calculator.calculate_comprehensive_pnl(
+        TradeMetrics(
+            entry_price=100.0, exit_price=100.0, position_size=1.0, holding_period=1,
+            volatility_at_entry=0.0, market_regime=MarketRegime.HAYEKIAN_ORDER,
+            momentum_score=0.0, technical_score=0.5, fundamental_score=0.5,
+            behavioral_bias=0.0, transaction_costs=0.0
+        ),
+        {'price_changes': prices[1:] - prices[0], 'volume_changes': volumes[1:], 'historical_returns': returns},
+        {}
+    )
+    economic_calculator.calculate_strategy_performance_economics(returns.tolist(), 1.0, {})
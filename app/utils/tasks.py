@@ -0,0 +1,14 @@
+import asyncio
+
+# The event loop only keeps weak references to tasks, so fire-and-forget work
+# (notification emails, background cache refreshes) must be held here until it
+# finishes or it can be garbage-collected mid-flight.
+_background_tasks = set()
+
+
+def spawn(coro):
+    """Schedule ``coro`` to run in the background without awaiting it."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
@@ -0,0 +1,17 @@
+-- Running net buy quantity per asset
+-- Sell orders used to check SUM(size) over every buy in trades; they now read
+-- a single row here, kept up to date by the /trade handler in the same
+-- transaction as the trade insert. Run once before deploying; safe to re-run.
+
+CREATE TABLE IF NOT EXISTS asset_buy_totals (
+    asset       TEXT PRIMARY KEY,
+    total_size  DECIMAL(20, 8) NOT NULL DEFAULT 0
+);
+
+-- Backfill from existing trades (buys add, sells subtract)
+INSERT INTO asset_buy_totals (asset, total_size)
+SELECT asset,
+       SUM(CASE WHEN side = 'buy' THEN size ELSE -size END)
+FROM trades
+GROUP BY asset
+ON CONFLICT (asset) DO UPDATE SET total_size = EXCLUDED.total_size;
@@ -0,0 +1,15 @@
+-- Covering index for /trades and an index for the admin withdrawal queue.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so run
+-- these statements one at a time (psql, or the Supabase SQL editor with one
+-- statement per run). Safe to re-run.
+
+-- /trades selects only these columns for one user, newest first; with them
+-- in the index it becomes an index-only scan. Replaces ix_trades_user_created.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trades_user_created_cov
+    ON trades (user_id, created_at DESC) INCLUDE (id, asset, side, size, price);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_trades_user_created;
+
+-- GET /admin/withdrawals lists every withdrawal ORDER BY requested_at DESC.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_withdrawals_requested
+    ON withdrawals (requested_at DESC);
@@ -0,0 +1,22 @@
+-- Composite / partial indexes for the per-user history queries
+-- (/trades, /deposits, /withdrawals, /copy/subscriptions and the
+-- "latest wallet row" lookup). CREATE INDEX CONCURRENTLY cannot run inside a
+-- transaction block, so run these statements one at a time (psql, or the
+-- Supabase SQL editor with one statement per run). Safe to re-run.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trades_user_created
+    ON trades (user_id, created_at DESC);
+
+-- Covering index: the ORDER BY created_at DESC LIMIT 1 balance/profit lookup
+-- becomes an index-only scan.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_wallet_tx_user_created
+    ON wallet_transactions (user_id, created_at DESC) INCLUDE (balance_after, profit_after);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_wallet_tx_deposits
+    ON wallet_transactions (user_id, created_at DESC) WHERE transaction_type = 'deposit';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_withdrawals_user
+    ON withdrawals (user_id, requested_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_copy_sub_follower
+    ON copy_trading_subscriptions (follower_id, created_at DESC) WHERE is_active;
@@ -4,9 +4,35 @@
 # If it's inside a package 'my_app/__init__.py', it will be:
 # from my_app import create_app
 from app import App # Assuming your app code is in 'main.py'
+from hypercorn.config import Config
+from hypercorn.run import run
+import os
+import sys
 
 app = App(__name__)
 
+
+def hypercorn_config() -> Config:
+    """Hypercorn settings for `python run.py`; tuned for production unless ENV=dev."""
+    config = Config()
+    config.application_path = "run:app"
+    config.bind = [f"0.0.0.0:{int(os.environ.get('PORT', 5000))}"]
+    config.keep_alive_timeout = 75
+
+    if os.environ.get('ENV') == 'dev':
+        # Single process with auto-reload on code changes
+        config.use_reloader = True
+    else:
+        # One worker per core on the libuv event loop. HTTP/2 needs no switch:
+        # Hypercorn negotiates it (ALPN over TLS, h2c upgrade) whenever h2 is installed.
+        config.workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+        config.worker_class = "asyncio" if sys.platform == "win32" else "uvloop"
+    return config
+
+
+if __name__ == '__main__':
+    run(hypercorn_config())
+
 # async def main():
 #     """
 #     Main entry point to create and run the Quart application.
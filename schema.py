@@ -0,0 +1,44 @@
+import hashlib
+import pathlib
+
+import asyncpg
+
+# supabase_schema.sql is the single definition of the schema. setup_db.py
+# applies it and the app only checks it; read and hash it once at import.
+SCHEMA_SQL = pathlib.Path(__file__).with_name('supabase_schema.sql').read_text(encoding='utf-8')
+SCHEMA_HASH = hashlib.sha256(SCHEMA_SQL.encode('utf-8')).hexdigest()
+
+
+async def apply_schema(conn):
+    """
+    Run supabase_schema.sql unless this exact file was already applied.
+    Returns True when the schema was executed.
+    """
+    async with conn.transaction():
+        # Two setup runs at once would both see a stale hash; the second
+        # waits here and then finds it up to date
+        await conn.execute("SELECT pg_advisory_xact_lock(hashtext('_schema_hash'))")
+        await conn.execute('''
+            CREATE TABLE IF NOT EXISTS _schema_hash (
+                id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                h TEXT NOT NULL
+            )
+        ''')
+        if await conn.fetchval('SELECT h FROM _schema_hash WHERE id = 1') == SCHEMA_HASH:
+            return False
+        # Execute the entire schema as one simple-protocol
+        # multi-statement command - let Supabase handle the parsing
+        await conn.execute(SCHEMA_SQL)
+        await conn.execute('''
+            INSERT INTO _schema_hash (id, h) VALUES (1, $1)
+            ON CONFLICT (id) DO UPDATE SET h = EXCLUDED.h
+        ''', SCHEMA_HASH)
+        return True
+
+
+async def schema_is_current(conn):
+    """True when the database was last set up from this supabase_schema.sql."""
+    try:
+        return await conn.fetchval('SELECT h FROM _schema_hash WHERE id = 1') == SCHEMA_HASH
+    except asyncpg.UndefinedTableError:
+        return False
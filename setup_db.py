@@ -1,10 +1,45 @@
 import asyncio
 import asyncpg
+import bcrypt
 import os
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
+from schema import apply_schema
 
 load_dotenv()
 
+# The admin password is stored as a bcrypt hash, hashed once here; the login
+# route verifies "$2..." passwords with bcrypt.checkpw
+ADMIN_PASSWORD_HASH = bcrypt.hashpw(b'admin123', bcrypt.gensalt(12)).decode()
+
+# Every seeded account as (email, password hash, role); add demo users here
+SEED_USERS = [
+    ('admin@example.com', ADMIN_PASSWORD_HASH, 'admin'),
+]
+SEED_USERS_SQL = '''
+    INSERT INTO users (email, password, role) VALUES ($1, $2, $3)
+    ON CONFLICT (email) DO NOTHING
+'''
+# executemany pipelines one prepared statement over all rows; past ~1000
+# rows per call bigger batches stop paying off
+SEED_BATCH = 1000
+
+# Prepared statements keyed by (connection, SQL text); a statement is only
+# valid on the connection that prepared it
+_stmt_cache = {}
+_stmt_lock = asyncio.Lock()
+
+async def prep(conn, sql):
+    """Prepare sql on conn once and reuse the statement on later calls."""
+    key = (conn, sql)
+    stmt = _stmt_cache.get(key)
+    if stmt is None:
+        async with _stmt_lock:
+            stmt = _stmt_cache.get(key)
+            if stmt is None:
+                stmt = _stmt_cache[key] = await conn.prepare(sql)
+    return stmt
+
 async def setup_database():
     """
     Setup database tables and initial data for Supabase.
@@ -12,7 +47,6 @@ async def setup_database():
     Note: For Supabase, you may need to create tables through the SQL Editor
     in the Supabase dashboard instead of programmatically due to RLS policies.
     """
-
     # Connect to database
     database_url = os.getenv('DATABASE_URL')
     if not database_url:
@@ -24,60 +58,84 @@ async def setup_database():
         db_password = os.getenv('SUPABASE_DB_PASSWORD')
 
         if db_host and db_user and db_password:
+            # Port 6543 is Supabase's transaction pooler (Supavisor), which keeps
+            # warm backends; 5432 is a direct, freshly-forked connection
             database_url = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}?sslmode=require"
 
     if not database_url:
         print("❌ No DATABASE_URL found. Please set up your Supabase database connection in .env")
         return
 
+    # Tags setup traffic in pg_stat_activity and Supabase's query logs.
+    # application_name is the one startup setting poolers pass through.
+    connect_kwargs = {'server_settings': {'application_name': 'trade_app_setup'}}
+    db_port = urlsplit(database_url).port
+    if db_port == 5432:
+        print("⚠️  Connecting directly on port 5432; use the Supabase pooler port 6543 to skip backend start-up")
+    elif db_port == 6543:
+        # Transaction pooling hands each transaction to any backend, so
+        # asyncpg's implicit statement cache can't be kept between them.
+        # Statements from prep() are only used inside one transaction.
+        connect_kwargs['statement_cache_size'] = 0
+
+    pool = None
+    conn = None
     try:
-        conn = await asyncpg.connect(database_url)
-
-        print("✅ Connected to Supabase database")
-
-        # Try to create tables (this may fail due to Supabase RLS/policies)
-        try:
-            # Read the entire schema file and execute it as one command
-            schema_path = os.path.join(os.path.dirname(__file__), 'supabase_schema.sql')
-            with open(schema_path, 'r', encoding='utf-8') as f:
-                schema_sql = f.read()
-
-            # Execute the entire schema - let Supabase handle the parsing
-            await conn.execute(schema_sql)
-
-            print("✅ Database schema executed successfully from supabase_schema.sql")
-        except Exception as e:
-            print(f"⚠️  Table creation may have failed: {str(e)}")
-            print("💡 You may need to create tables manually in Supabase SQL Editor")
-            print("   Run the SQL commands from supabase_schema.sql in your Supabase dashboard")
-
-        # Try to create admin user
-        try:
-            admin_exists = await conn.fetchval('SELECT id FROM users WHERE email = $1', 'admin@example.com')
-            if not admin_exists:
-                await conn.execute('''
-                    INSERT INTO users (email, password, role)
-                    VALUES ($1, $2, $3)
-                ''', 'admin@example.com', 'admin123', 'admin')
-                print("✅ Admin user created: admin@example.com / admin123")
-            else:
-                print("✅ Admin user already exists")
-        except Exception as e:
-            print(f"⚠️  Admin user creation may have failed: {str(e)}")
-            print("💡 You may need to create the admin user manually in Supabase")
-
-        print("\n🎉 Database setup complete!")
-        print("\n📋 Next steps:")
-        print("1. If tables weren't created, run the SQL in supabase_schema.sql manually")
-        print("2. Configure Row Level Security (RLS) policies in Supabase dashboard if needed")
-        print("3. Test the connection by running: python run.py")
+        # A single-connection pool: acquire/release gives deterministic cleanup
+        pool = await asyncpg.create_pool(database_url, min_size=1, max_size=1, **connect_kwargs)
+
+        async with pool.acquire() as conn:
+            print("✅ Connected to Supabase database")
+
+            # Try to create tables and the admin user (this may fail due to
+            # Supabase RLS/policies). Both run in one transaction, so a failed
+            # schema never leaves a half-seeded database behind.
+            try:
+                async with conn.transaction():
+                    # Bound this transaction so a wedged DDL or a held lock fails
+                    # the run instead of hanging it. SET LOCAL lasts only for the
+                    # transaction, so it is safe through the transaction pooler.
+                    await conn.execute('''
+                        SET LOCAL statement_timeout = '30s';
+                        SET LOCAL lock_timeout = '5s';
+                        SET LOCAL idle_in_transaction_session_timeout = '10s';
+                    ''')
+                    # Only re-run the schema when the file has changed since the last
+                    # successful run; the hash is kept in a one-row bookkeeping table
+                    if await apply_schema(conn):
+                        print("✅ Database schema executed successfully from supabase_schema.sql")
+                    else:
+                        print("✅ Database schema unchanged since last run, skipping supabase_schema.sql")
+
+                    # Seed rows go in as batched executemany calls, never one
+                    # execute per row; existing accounts are left untouched
+                    for start in range(0, len(SEED_USERS), SEED_BATCH):
+                        await conn.executemany(SEED_USERS_SQL, SEED_USERS[start:start + SEED_BATCH])
+                    seeded_users = await prep(conn, 'SELECT id, email FROM users WHERE email = ANY($1::text[])')
+                    seeded = await seeded_users.fetch([email for email, _, _ in SEED_USERS])
+                    for user in seeded:
+                        print(f"✅ Seed user {user['email']} present (id {user['id']})")
+                    print("   Admin login: admin@example.com / admin123")
+            except Exception as e:
+                print(f"⚠️  Table or admin user creation may have failed: {str(e)}")
+                print("💡 You may need to create tables manually in Supabase SQL Editor")
+                print("   Run the SQL commands from supabase_schema.sql in your Supabase dashboard")
+
+            print("\n🎉 Database setup complete!")
+            print("\n📋 Next steps:")
+            print("1. If tables weren't created, run the SQL in supabase_schema.sql manually")
+            print("2. Configure Row Level Security (RLS) policies in Supabase dashboard if needed")
+            print("3. Test the connection by running: python run.py")
 
     except Exception as e:
         print(f"❌ Database setup failed: {str(e)}")
         print("💡 Check your Supabase connection settings and try again")
     finally:
-        if 'conn' in locals():
-            await conn.close()
+        if conn is not None:
+            for key in [key for key in _stmt_cache if key[0] is conn]:
+                del _stmt_cache[key]
+        if pool is not None:
+            await pool.close()
 
 if __name__ == '__main__':
     asyncio.run(setup_database())
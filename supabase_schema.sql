@@ -4,65 +4,99 @@
 -- Users table
 CREATE TABLE IF NOT EXISTS users (
     id SERIAL PRIMARY KEY,
-    email VARCHAR(255) UNIQUE NOT NULL,
-    password VARCHAR(255) NOT NULL,
-    role VARCHAR(50) DEFAULT 'user' CHECK (role IN ('user', 'admin')),
+    email TEXT UNIQUE NOT NULL,
+    password TEXT NOT NULL,
+    role TEXT DEFAULT 'user' CHECK (role IN ('user', 'admin')),
     is_blocked BOOLEAN DEFAULT FALSE,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
+    created_at TIMESTAMPTZ DEFAULT now() NOT NULL
+) WITH (fillfactor = 90);  -- role/is_blocked/password updates stay on-page (HOT)
 
 -- Wallet transactions table (updated with profit support)
 CREATE TABLE IF NOT EXISTS wallet_transactions (
     id SERIAL PRIMARY KEY,
     user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
-    transaction_type VARCHAR(50) NOT NULL CHECK (transaction_type IN ('deposit', 'withdraw', 'transfer_in', 'transfer_out', 'trade_buy', 'trade_sell', 'admin_adjustment_positive', 'admin_adjustment_negative', 'strategy_investment', 'strategy_unsubscription', 'profit_adjustment_positive', 'profit_adjustment_negative')),
-    amount DECIMAL(20, 8) NOT NULL CHECK (amount > 0),
+    transaction_type TEXT NOT NULL CHECK (transaction_type IN ('deposit', 'withdraw', 'transfer_in', 'transfer_out', 'trade_buy', 'trade_sell', 'admin_adjustment_positive', 'admin_adjustment_negative', 'strategy_investment', 'strategy_unsubscription', 'profit_adjustment_positive', 'profit_adjustment_negative')),
+    amount DECIMAL(20, 8) NOT NULL CHECK (amount <> 0),  -- signed: debits (buys, transfers out, investments) are negative
     balance_before DECIMAL(20, 8) NOT NULL,
     balance_after DECIMAL(20, 8) NOT NULL,
     profit_before DECIMAL(20, 8) DEFAULT 0,
     profit_after DECIMAL(20, 8) DEFAULT 0,
-    reference_id VARCHAR(100), -- for trade_id or withdrawal_id
+    reference_id TEXT, -- for trade_id or withdrawal_id
     description TEXT,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
+    created_at TIMESTAMPTZ DEFAULT now() NOT NULL
+) WITH (fillfactor = 100);  -- append-only ledger, never updated
 
 -- Trades table
 CREATE TABLE IF NOT EXISTS trades (
     id SERIAL PRIMARY KEY,
     user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
-    asset VARCHAR(50) NOT NULL,
-    side VARCHAR(10) NOT NULL CHECK (side IN ('buy', 'sell')),
+    asset TEXT NOT NULL,
+    side TEXT NOT NULL CHECK (side IN ('buy', 'sell')),
     size DECIMAL(20, 8) NOT NULL CHECK (size > 0),
     price DECIMAL(20, 8) NOT NULL CHECK (price > 0),
     total DECIMAL(20, 8) NOT NULL CHECK (total > 0),
-    status VARCHAR(50) DEFAULT 'completed' CHECK (status IN ('pending', 'completed', 'cancelled')),
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
-);
+    status TEXT DEFAULT 'completed' CHECK (status IN ('pending', 'completed', 'cancelled')),
+    created_at TIMESTAMPTZ DEFAULT now() NOT NULL
+) WITH (fillfactor = 100);  -- append-only
 
 -- Withdrawals table
 CREATE TABLE IF NOT EXISTS withdrawals (
     id SERIAL PRIMARY KEY,
     user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
     amount DECIMAL(20, 8) NOT NULL CHECK (amount > 0),
-    status VARCHAR(50) DEFAULT 'pending' CHECK (status IN ('pending', 'approved', 'rejected')),
-    requested_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
-    processed_at TIMESTAMP WITH TIME ZONE,
+    status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'approved', 'rejected')),
+    requested_at TIMESTAMPTZ DEFAULT now() NOT NULL,
+    processed_at TIMESTAMPTZ,
     admin_id INTEGER REFERENCES users(id), -- who approved/rejected
-    notes TEXT
+    notes TEXT,
+    network TEXT,
+    wallet_address TEXT
+) WITH (fillfactor = 90);  -- status is updated on approve/reject
+
+-- Investment strategies offered to users
+CREATE TABLE IF NOT EXISTS strategies (
+    id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    category TEXT NOT NULL, -- 'crypto' or 'quant'
+    risk_level TEXT NOT NULL, -- 'low', 'medium', 'high'
+    expected_roi DECIMAL(5, 2) NOT NULL, -- Daily ROI percentage
+    min_investment DECIMAL(20, 8) NOT NULL,
+    max_investment DECIMAL(20, 8),
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMPTZ DEFAULT now() NOT NULL
+);
+
+-- User investments in strategies
+CREATE TABLE IF NOT EXISTS strategy_subscriptions (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    strategy_id INTEGER REFERENCES strategies(id),
+    invested_amount DECIMAL(20, 8) NOT NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    subscribed_at TIMESTAMPTZ DEFAULT now() NOT NULL,
+    unsubscribed_at TIMESTAMPTZ,
+    UNIQUE(user_id, strategy_id)
 );
 
 -- Copy trading subscriptions table
 CREATE TABLE IF NOT EXISTS copy_trading_subscriptions (
     id SERIAL PRIMARY KEY,
     follower_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
-    trader_id VARCHAR(100) NOT NULL,
+    trader_id TEXT NOT NULL,
     allocation DECIMAL(5, 2) NOT NULL CHECK (allocation > 0 AND allocation <= 100),
     is_active BOOLEAN DEFAULT TRUE,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now() NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT now() NOT NULL,
     UNIQUE(follower_id, trader_id)
 );
 
+-- Running net buy quantity per asset (checked by sell orders instead of SUM over trades)
+CREATE TABLE IF NOT EXISTS asset_buy_totals (
+    asset TEXT PRIMARY KEY,
+    total_size DECIMAL(20, 8) NOT NULL DEFAULT 0
+);
+
 -- Profit tracking tables for complex P&L calculations
 CREATE TABLE IF NOT EXISTS profit_snapshots (
     id SERIAL PRIMARY KEY,
@@ -78,7 +112,7 @@ CREATE TABLE IF NOT EXISTS profit_snapshots (
     max_drawdown DECIMAL(10, 6) DEFAULT 0,
     volatility DECIMAL(10, 6) DEFAULT 0,
     snapshot_date DATE DEFAULT CURRENT_DATE,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now() NOT NULL,
     UNIQUE(user_id, snapshot_date)
 );
 
@@ -94,15 +128,15 @@ CREATE TABLE IF NOT EXISTS trade_profits (
     unrealized_pnl DECIMAL(20, 8) DEFAULT 0,
     holding_period_hours INTEGER DEFAULT 0,
     volatility_at_entry DECIMAL(10, 6) DEFAULT 0,
-    market_regime VARCHAR(20) DEFAULT 'neutral', -- bull, bear, neutral, volatile
+    market_regime TEXT DEFAULT 'neutral', -- bull, bear, neutral, volatile
     risk_adjusted_return DECIMAL(10, 6) DEFAULT 0,
     alpha_contribution DECIMAL(20, 8) DEFAULT 0,
     beta_exposure DECIMAL(10, 6) DEFAULT 1,
     momentum_score DECIMAL(10, 6) DEFAULT 0,
     technical_score DECIMAL(10, 6) DEFAULT 0,
     fundamental_score DECIMAL(10, 6) DEFAULT 0,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL
+    created_at TIMESTAMPTZ DEFAULT now() NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT now() NOT NULL
 );
 
 -- Strategy performance tracking with Newton-inspired calculations
@@ -128,7 +162,7 @@ CREATE TABLE IF NOT EXISTS strategy_performance (
     recovery_factor DECIMAL(10, 6) DEFAULT 0,
     ulcer_index DECIMAL(10, 6) DEFAULT 0,
     tail_ratio DECIMAL(10, 6) DEFAULT 0,
-    last_updated TIMESTAMP WITH TIME ZONE DEFAULT TIMEZONE('utc'::text, NOW()) NOT NULL,
+    last_updated TIMESTAMPTZ DEFAULT now() NOT NULL,
     UNIQUE(strategy_subscription_id)  -- Add unique constraint for UPSERT
 );
 
@@ -154,6 +188,24 @@ BEGIN
     END IF;
 END $$;
 
+-- Columns added after the first release, for databases created before them
+ALTER TABLE wallet_transactions
+ADD COLUMN IF NOT EXISTS profit_before DECIMAL(20, 8) DEFAULT 0,
+ADD COLUMN IF NOT EXISTS profit_after DECIMAL(20, 8) DEFAULT 0;
+ALTER TABLE withdrawals
+ADD COLUMN IF NOT EXISTS network TEXT,
+ADD COLUMN IF NOT EXISTS wallet_address TEXT;
+
+-- Ledger amounts are signed; replace the old amount > 0 check. NOT VALID skips
+-- the full-table scan, existing rows already satisfy it
+ALTER TABLE wallet_transactions DROP CONSTRAINT IF EXISTS wallet_transactions_amount_check;
+ALTER TABLE wallet_transactions ADD CONSTRAINT wallet_transactions_amount_check CHECK (amount <> 0) NOT VALID;
+
+-- Page fill for tables created before the WITH (fillfactor) clauses above;
+-- applies to newly written pages only
+ALTER TABLE users SET (fillfactor = 90);
+ALTER TABLE withdrawals SET (fillfactor = 90);
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_wallet_transactions_user_id ON wallet_transactions(user_id);
@@ -171,9 +223,21 @@ CREATE INDEX IF NOT EXISTS idx_trade_profits_user_id ON trade_profits(user_id);
 CREATE INDEX IF NOT EXISTS idx_strategy_performance_subscription_id ON strategy_performance(strategy_subscription_id);
 CREATE INDEX IF NOT EXISTS idx_strategy_performance_user_id ON strategy_performance(user_id);
 
+-- Per-user history queries (WHERE user_id = $1 ORDER BY created_at DESC)
+-- Covering: /trades reads only these columns, so it is an index-only scan
+CREATE INDEX IF NOT EXISTS ix_trades_user_created_cov ON trades(user_id, created_at DESC) INCLUDE (id, asset, side, size, price);
+DROP INDEX IF EXISTS ix_trades_user_created;  -- superseded by ix_trades_user_created_cov
+CREATE INDEX IF NOT EXISTS ix_wallet_tx_user_created ON wallet_transactions(user_id, created_at DESC) INCLUDE (balance_after, profit_after);
+CREATE INDEX IF NOT EXISTS ix_wallet_tx_deposits ON wallet_transactions(user_id, created_at DESC) WHERE transaction_type = 'deposit';
+CREATE INDEX IF NOT EXISTS ix_withdrawals_user ON withdrawals(user_id, requested_at DESC);
+CREATE INDEX IF NOT EXISTS ix_copy_sub_follower ON copy_trading_subscriptions(follower_id, created_at DESC) WHERE is_active;
+-- Admin withdrawal queue (ORDER BY requested_at DESC over all users)
+CREATE INDEX IF NOT EXISTS ix_withdrawals_requested ON withdrawals(requested_at DESC);
+
 -- Insert admin user (change password in production!)
+-- The password is 'admin123' as a bcrypt hash (cost 12)
 INSERT INTO users (email, password, role)
-VALUES ('admin@example.com', 'admin123', 'admin')
+VALUES ('admin@example.com', '$2b$12$UpZGIhp5Jw3KDH9GZRmEPeCe.KNdrsnbzni7DO6FExRv7ixXPb0bW', 'admin')
 ON CONFLICT (email) DO NOTHING;
 
 -- Enable Row Level Security (RLS) - optional but recommended for Supabase
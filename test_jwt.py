@@ -4,11 +4,107 @@ Comprehensive test script to verify JWT authentication is working correctly
 """
 import asyncio
 import aiohttp
-import json
+import logging
+import orjson
 import os
+from dataclasses import dataclass, field
+
+log = logging.getLogger("jwt_test")
+
+@dataclass(frozen=True, slots=True)
+class Endpoints:
+    """Every URL the test hits, built once from the server's base URL"""
+    base_url: str
+    login: str = field(init=False)
+    user: str = field(init=False)
+    wallet: str = field(init=False)
+    strategies: str = field(init=False)
+    my_strategies: str = field(init=False)
+    refresh: str = field(init=False)
+    admin_users: str = field(init=False)
+    logout: str = field(init=False)
+
+    def __post_init__(self):
+        api = f"{self.base_url}/api"
+        for name, path in (('login', '/login'), ('user', '/user'), ('wallet', '/wallet'),
+                           ('strategies', '/strategies'),
+                           ('my_strategies', '/strategies/my-strategies'),
+                           ('refresh', '/refresh'), ('admin_users', '/admin/users'),
+                           ('logout', '/logout')):
+            object.__setattr__(self, name, api + path)
+
+async def jget(response):
+    """Decode a JSON response body with orjson (no content-type sniffing)"""
+    return orjson.loads(await response.read())
+
+async def expect(name, resp, code=200, on_ok=None):
+    """
+    Turn a response into a (name, passed, detail) result. on_ok is the detail
+    on success: a string, or a callable given the decoded JSON body.
+    """
+    if resp.status != code:
+        return name, False, f"status {resp.status}"
+    if callable(on_ok):
+        return name, True, on_ok(await jget(resp))
+    return name, True, on_ok or f"status {resp.status}"
+
+# Independent checks run concurrently once logged in; each returns
+# (test name, passed, detail) and the outcomes are reported together at the end.
+
+async def check_current_user(session, headers, urls):
+    async with session.get(urls.user, headers=headers) as response:
+        return await expect("2️⃣ Get current user", response,
+                            on_ok=lambda user_data: f"User data: {user_data}")
+
+async def check_wallet(session, headers, urls):
+    async with session.get(urls.wallet, headers=headers) as response:
+        return await expect("3️⃣ Wallet balance", response,
+                            on_ok=lambda balance_data: f"Balance: {balance_data}")
+
+async def check_strategies(session, headers, urls):
+    # Public endpoint, no auth headers
+    async with session.get(urls.strategies) as response:
+        return await expect("4️⃣ Get strategies", response,
+                            on_ok=lambda data: f"Found {len(data.get('strategies', []))} strategies")
+
+async def check_my_strategies(session, headers, urls):
+    async with session.get(urls.my_strategies, headers=headers) as response:
+        return await expect("5️⃣ Get my strategies", response,
+                            on_ok=lambda data: f"{len(data.get('strategies', []))} subscriptions")
+
+async def check_admin_denied(session, headers, urls):
+    # Should fail for a regular user
+    async with session.get(urls.admin_users, headers=headers) as response:
+        return await expect("7️⃣ Admin access denied", response, code=403,
+                            on_ok="Admin access correctly denied")
+
+async def check_token_refresh(session, refresh_token, urls):
+    async with session.post(urls.refresh, json={"refresh_token": refresh_token}) as response:
+        if response.status != 200:
+            return await expect("6️⃣ Token refresh", response)
+        refresh_data = await jget(response)
+        new_access_token = refresh_data.get('access_token')
+    if not new_access_token:
+        return "6️⃣ Token refresh", False, "no access_token in refresh response"
+
+    # Test with new token; a tighter bound so slow token validation shows up.
+    # check_current_user has already warmed this endpoint, so cold starts
+    # don't count against it.
+    new_headers = {"Authorization": f"Bearer {new_access_token}"}
+    try:
+        async with session.get(urls.user, headers=new_headers,
+                               timeout=aiohttp.ClientTimeout(total=1)) as response:
+            return await expect("6️⃣ Token refresh", response,
+                                on_ok=f"New token {new_access_token[:30]}... works correctly")
+    except asyncio.TimeoutError:
+        return "6️⃣ Token refresh", False, "new token not validated within 1 s"
+
+async def check_logout(session, urls):
+    async with session.post(urls.logout) as response:
+        return await expect("8️⃣ Logout", response, on_ok="Logout successful")
 
 async def test_jwt_comprehensive():
-    base_url = "http://localhost:5000"
+    urls = Endpoints("http://localhost:5000")
 
     # Test user credentials
     test_user = {
@@ -16,114 +112,66 @@ async def test_jwt_comprehensive():
         "password": "password123"
     }
 
-    async with aiohttp.ClientSession() as session:
-        print("🔍 Testing Cookie Cash JWT Authentication System")
-        print("=" * 50)
+    # One keep-alive connector for every request in the run, so the
+    # concurrent checks share warm connections instead of reconnecting
+    connector = aiohttp.TCPConnector(
+        limit=32,
+        limit_per_host=16,
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+    )
+    results = []
+    # Every request is bounded, so a hung endpoint fails its check (and only
+    # that one, thanks to return_exceptions) instead of stalling the run
+    async with aiohttp.ClientSession(connector=connector,
+                                     timeout=aiohttp.ClientTimeout(total=5, connect=1),
+                                     json_serialize=lambda obj: orjson.dumps(obj).decode()) as session:
+        log.info("🔍 Testing Cookie Cash JWT Authentication System")
+        log.info("=" * 50)
 
-        # Test 1: Login and get JWT tokens
-        print("\n1️⃣ Testing Login...")
         try:
-            async with session.post(f"{base_url}/api/login", json=test_user) as response:
+            # Test 1: Login and get JWT tokens
+            async with session.post(urls.login, json=test_user) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await jget(response)
                     access_token = data.get('access_token')
                     refresh_token = data.get('refresh_token')
-                    user_data = data.get('user')
-
-                    print("✅ Login successful")
-                    print(f"   Access Token: {access_token[:30]}...")
-                    print(f"   Refresh Token: {refresh_token[:30]}...")
-                    print(f"   User: {user_data}")
-
-                    headers = {"Authorization": f"Bearer {access_token}"}
-
-                    # Test 2: Get current user
-                    print("\n2️⃣ Testing Get Current User...")
-                    async with session.get(f"{base_url}/api/user", headers=headers) as response:
-                        if response.status == 200:
-                            user_data = await response.json()
-                            print("✅ Get current user successful")
-                            print(f"   User data: {user_data}")
-                        else:
-                            print(f"❌ Get current user failed: {response.status}")
-
-                    # Test 3: Get wallet balance
-                    print("\n3️⃣ Testing Wallet Balance...")
-                    async with session.get(f"{base_url}/api/wallet", headers=headers) as response:
-                        if response.status == 200:
-                            balance_data = await response.json()
-                            print("✅ Wallet balance successful")
-                            print(f"   Balance: {balance_data}")
-                        else:
-                            print(f"❌ Wallet balance failed: {response.status}")
-
-                    # Test 4: Get strategies (public endpoint)
-                    print("\n4️⃣ Testing Get Strategies...")
-                    async with session.get(f"{base_url}/api/strategies") as response:
-                        if response.status == 200:
-                            strategies_data = await response.json()
-                            print("✅ Get strategies successful")
-                            print(f"   Found {len(strategies_data.get('strategies', []))} strategies")
-                        else:
-                            print(f"❌ Get strategies failed: {response.status}")
-
-                    # Test 5: Get my strategies (protected)
-                    print("\n5️⃣ Testing Get My Strategies...")
-                    async with session.get(f"{base_url}/api/strategies/my-strategies", headers=headers) as response:
-                        if response.status == 200:
-                            my_strategies = await response.json()
-                            print("✅ Get my strategies successful")
-                            print(f"   My strategies: {len(my_strategies.get('strategies', []))} subscriptions")
-                        else:
-                            print(f"❌ Get my strategies failed: {response.status}")
-
-                    # Test 6: Test token refresh
-                    print("\n6️⃣ Testing Token Refresh...")
-                    refresh_data = {"refresh_token": refresh_token}
-                    async with session.post(f"{base_url}/api/refresh", json=refresh_data) as response:
-                        if response.status == 200:
-                            refresh_data = await response.json()
-                            new_access_token = refresh_data.get('access_token')
-                            print("✅ Token refresh successful")
-                            print(f"   New access token: {new_access_token[:30]}...")
-
-                            # Test with new token
-                            new_headers = {"Authorization": f"Bearer {new_access_token}"}
-                            async with session.get(f"{base_url}/api/user", headers=new_headers) as response:
-                                if response.status == 200:
-                                    print("✅ New token works correctly")
-                                else:
-                                    print(f"❌ New token failed: {response.status}")
-
-                        else:
-                            print(f"❌ Token refresh failed: {response.status}")
-
-                    # Test 7: Test admin endpoint (should fail for regular user)
-                    print("\n7️⃣ Testing Admin Endpoint (should fail)...")
-                    async with session.get(f"{base_url}/api/admin/users", headers=headers) as response:
-                        if response.status == 403:
-                            print("✅ Admin access correctly denied")
-                        else:
-                            print(f"❌ Admin access unexpectedly allowed: {response.status}")
-
-                    # Test 8: Test logout
-                    print("\n8️⃣ Testing Logout...")
-                    async with session.post(f"{base_url}/api/logout") as response:
-                        if response.status == 200:
-                            print("✅ Logout successful")
-                        else:
-                            print(f"❌ Logout failed: {response.status}")
-
+                    results.append(("1️⃣ Login", True, f"User: {data.get('user')}"))
+                    log.debug("Access Token: %s...", access_token[:30])
+                    log.debug("Refresh Token: %s...", refresh_token[:30])
                 else:
-                    print(f"❌ Login failed: {response.status}")
-                    error = await response.text()
-                    print(f"   Error: {error}")
+                    access_token = None
+                    results.append(("1️⃣ Login", False, f"status {response.status}: {await response.text()}"))
+
+            if access_token:
+                headers = {"Authorization": f"Bearer {access_token}"}
+
+                # Tests 2-5 and 7 have no data dependency on each other
+                checks = (check_current_user, check_wallet, check_strategies,
+                          check_my_strategies, check_admin_denied)
+                outcomes = await asyncio.gather(
+                    *(check(session, headers, urls) for check in checks),
+                    return_exceptions=True
+                )
+                for check, outcome in zip(checks, outcomes):
+                    if isinstance(outcome, Exception):
+                        outcome = (check.__name__, False, f"exception: {outcome}")
+                    results.append(outcome)
+
+                # Token refresh and logout depend on the session state, in order
+                results.append(await check_token_refresh(session, refresh_token, urls))
+                results.append(await check_logout(session, urls))
 
         except Exception as e:
-            print(f"❌ Test failed with exception: {e}")
+            results.append(("Test run", False, f"exception: {e}"))
 
-        print("\n" + "=" * 50)
-        print("🏁 JWT Authentication Test Complete")
+    # One summary instead of a line per step
+    results.sort(key=lambda result: result[0])
+    log.info("\n".join("%s %-24s %s" % ("✅" if ok else "❌", name, detail) for name, ok, detail in results))
+    log.info("=" * 50)
+    log.info("🏁 JWT Authentication Test Complete: %d/%d passed",
+             sum(ok for _, ok, _ in results), len(results))
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     asyncio.run(test_jwt_comprehensive())